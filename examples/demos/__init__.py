@@ -0,0 +1 @@
+"""BPM DSL demonstration scripts."""
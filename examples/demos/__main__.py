@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Run the BPM DSL demos in a single interpreter.
+
+Each demo script can still be run on its own; this runner imports them
+once so that running several demos pays Python start-up and the parser,
+generator and validator imports only once.
+
+Usage (from the repository root):
+    python -m examples.demos            # run every demo
+    python -m examples.demos layout     # run a single demo
+"""
+
+import argparse
+import sys
+
+from . import demo, demo_advanced_layout, demo_default_flows, demo_service_task
+
+DEMOS = {
+    'basic': demo.main,
+    'layout': demo_advanced_layout.main,
+    'default_flow': demo_default_flows.main,
+    'service_task': demo_service_task.main,
+}
+
+
+def main(argv=None) -> int:
+    """Dispatch to the requested demo(s) and return a process exit code."""
+    parser = argparse.ArgumentParser(prog="python -m examples.demos",
+                                     description="Run BPM DSL demos.")
+    parser.add_argument('demo', nargs='?', default='all', choices=[*DEMOS, 'all'],
+                        help="Demo to run (default: all)")
+    args = parser.parse_args(argv)
+
+    names = list(DEMOS) if args.demo == 'all' else [args.demo]
+    status = 0
+    for name in names:
+        status = DEMOS[name]() or status
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
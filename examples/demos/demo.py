@@ -9,24 +9,55 @@ This script demonstrates all the capabilities of the BPM DSL:
 - CLI interface usage
 """
 
+import os
+import re
 import sys
 from pathlib import Path
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
 
+from bpm_dsl.ast_nodes import ScriptCall
 from bpm_dsl.parser import parse_bpm_file, parse_bpm_string
 from bpm_dsl.bpmn_generator import BPMNGenerator
 from bpm_dsl.validator import ProcessValidator
 
+# Shared instances; neither keeps state between runs
+_VALIDATOR = ProcessValidator()
+_GENERATOR = BPMNGenerator()
 
-def demo_parser():
-    """Demonstrate the DSL parser capabilities."""
-    print("🔍 PARSER DEMONSTRATION")
-    print("=" * 50)
-    
-    # Parse a simple inline DSL
-    simple_dsl = '''
+# Markers that identify Zeebe-ready BPMN output, matched in a single pass
+_ZEEBE_MARKERS = (
+    'xmlns:zeebe=',
+    'zeebe:script',
+    'zeebe:ioMapping',
+    'isExecutable="true"',
+)
+_ZEEBE_RE = re.compile('|'.join(re.escape(marker) for marker in _ZEEBE_MARKERS))
+
+# Use an Aho-Corasick automaton when pyahocorasick is installed; the regex
+# alternation above is the fallback
+try:
+    import ahocorasick
+except ImportError:
+    _ZEEBE_AUTOMATON = None
+else:
+    _ZEEBE_AUTOMATON = ahocorasick.Automaton()
+    for _marker in _ZEEBE_MARKERS:
+        _ZEEBE_AUTOMATON.add_word(_marker, _marker)
+    _ZEEBE_AUTOMATON.make_automaton()
+
+# Declaration prepended to every generated BPMN file
+_XML_HEADER = b'<?xml version="1.0" encoding="UTF-8"?>\n'
+
+# Element types whose script, mappings and result variable are listed
+_MAPPING_TYPES = (ScriptCall,)
+
+# Directories never worth descending into when looking for .bpm sources
+_SKIP_DIRS = frozenset({'.git', '__pycache__', '.venv', 'venv', 'node_modules', 'build', 'dist'})
+
+# Inline DSL parsed by demo_parser
+_DSL_SIMPLE = '''
     process "Demo Process 5" {
         id: "demo-process-5"
         version: "1.0"
@@ -64,36 +95,66 @@ def demo_parser():
         }
     }
     '''
+
+
+def _find_zeebe_markers(xml_content: str) -> set:
+    """Return the Zeebe markers present in the XML, scanning it once."""
+    if _ZEEBE_AUTOMATON is not None:
+        return {marker for _, marker in _ZEEBE_AUTOMATON.iter(xml_content)}
+    return {match.group(0) for match in _ZEEBE_RE.finditer(xml_content)}
+
+
+def _iter_bpm(root):
+    """Yield paths of .bpm files below root, pruning hidden and build dirs."""
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name in _SKIP_DIRS or entry.name.startswith('.'):
+                        continue
+                    stack.append(entry.path)
+                elif entry.name.endswith('.bpm'):
+                    yield entry.path
+
+
+def demo_parser():
+    """Demonstrate the DSL parser capabilities."""
+    print("🔍 PARSER DEMONSTRATION")
+    print("=" * 50)
     
+    # Parse a simple inline DSL
     try:
-        process = parse_bpm_string(simple_dsl)
+        process = parse_bpm_string(_DSL_SIMPLE)
         print(f"✅ Successfully parsed process: {process.name}")
         print(f"   ID: {process.id}")
         print(f"   Version: {process.version}")
         print(f"   Elements: {len(process.elements)}")
         print(f"   Flows: {len(process.flows)}")
         
-        print("\n📋 Process Elements:")
+        parts = ["\n📋 Process Elements:"]
         for i, element in enumerate(process.elements, 1):
             element_type = type(element).__name__
-            print(f"   {i}. {element_type}: {element.name} (ID: {element.id})")
+            parts.append(f"   {i}. {element_type}: {element.name} (ID: {element.id})")
             
             # Show additional details for script calls
-            if hasattr(element, 'script'):
-                print(f"      Script: {element.script}")
+            if isinstance(element, _MAPPING_TYPES):
+                parts.append(f"      Script: {element.script}")
                 if element.input_mappings:
-                    mappings = [f"{m.source} -> {m.target}" for m in element.input_mappings]
-                    print(f"      Input mappings: {mappings}")
+                    mappings = ", ".join(f"{m.source} -> {m.target}" for m in element.input_mappings)
+                    parts.append(f"      Input mappings: {mappings}")
                 if element.output_mappings:
-                    mappings = [f"{m.source} -> {m.target}" for m in element.output_mappings]
-                    print(f"      Output mappings: {mappings}")
+                    mappings = ", ".join(f"{m.source} -> {m.target}" for m in element.output_mappings)
+                    parts.append(f"      Output mappings: {mappings}")
                 if element.result_variable:
-                    print(f"      Result variable: {element.result_variable}")
+                    parts.append(f"      Result variable: {element.result_variable}")
+        sys.stdout.write("\n".join(parts) + "\n")
         
-        print("\n🔄 Process Flows:")
+        parts = ["\n🔄 Process Flows:"]
         for i, flow in enumerate(process.flows, 1):
             condition_str = f" [when: {flow.condition}]" if flow.condition else ""
-            print(f"   {i}. {flow.source_id} → {flow.target_id}{condition_str}")
+            parts.append(f"   {i}. {flow.source_id} → {flow.target_id}{condition_str}")
+        sys.stdout.write("\n".join(parts) + "\n")
         
         return process
         
@@ -112,21 +173,18 @@ def demo_validator(process):
         return False
     
     try:
-        validator = ProcessValidator()
-        result = validator.validate(process)
+        result = _VALIDATOR.validate(process)
         
         if result.is_valid:
             print("✅ Process validation PASSED!")
             
             if result.warnings:
                 print(f"\n⚠️  Warnings ({len(result.warnings)}):")
-                for warning in result.warnings:
-                    print(f"   • {warning}")
+                print(*(f"   • {warning}" for warning in result.warnings), sep="\n")
         else:
             print("❌ Process validation FAILED!")
             print(f"\n🚫 Errors ({len(result.errors)}):")
-            for error in result.errors:
-                print(f"   • {error}")
+            print(*(f"   • {error}" for error in result.errors), sep="\n")
         
         return result.is_valid
         
@@ -145,33 +203,29 @@ def demo_bpmn_generator(process):
         return
     
     try:
-        generator = BPMNGenerator()
-        xml_content = generator.generate(process)
+        xml_content = _GENERATOR.generate(process)
+        xml_bytes = xml_content.encode('utf-8')
         
-        print(f"✅ Successfully generated BPMN XML ({len(xml_content)} characters)")
+        print(f"✅ Successfully generated BPMN XML ({len(xml_content)} characters, {len(xml_bytes)} bytes)")
         
-        # Save to file
+        # Save the document we already have instead of generating it again
         output_file = "demo_process.bpmn"
-        generator.save_to_file(process, output_file)
+        Path(output_file).write_bytes(_XML_HEADER + xml_bytes)
         print(f"💾 Saved BPMN to: {output_file}")
         
         # Show XML structure
-        lines = xml_content.split('\n')
-        print(f"\n📄 BPMN XML Structure (first 10 lines):")
+        lines = xml_content.split('\n', 10)
+        parts = ["\n📄 BPMN XML Structure (first 10 lines):"]
         for i, line in enumerate(lines[:10], 1):
-            print(f"   {i:2d}: {line}")
+            parts.append(f"   {i:2d}: {line}")
+        sys.stdout.write("\n".join(parts) + "\n")
         
         # Check for Zeebe compatibility markers
-        zeebe_markers = [
-            'xmlns:zeebe=',
-            'zeebe:script',
-            'zeebe:ioMapping',
-            'isExecutable="true"'
-        ]
+        found = _find_zeebe_markers(xml_content)
         
         print(f"\n🎯 Zeebe Compatibility Check:")
-        for marker in zeebe_markers:
-            if marker in xml_content:
+        for marker in _ZEEBE_MARKERS:
+            if marker in found:
                 print(f"   ✅ {marker}")
             else:
                 print(f"   ❌ {marker}")
@@ -180,45 +234,49 @@ def demo_bpmn_generator(process):
         print(f"❌ BPMN generation error: {e}")
 
 
-def demo_file_processing():
-    """Demonstrate processing existing DSL files."""
+def demo_file_processing(verbose: bool = False):
+    """Demonstrate processing existing DSL files.
+
+    Only the first .bpm file found is processed, so the tree walk stops
+    there unless ``verbose`` asks for the full listing.
+    """
     print("\n🔍 FILE PROCESSING DEMONSTRATION")
     print("=" * 50)
     
-    # Find available DSL files
-    dsl_files = list(Path(".").glob("**/*.bpm"))
+    # Find the first available DSL file
+    bpm_paths = _iter_bpm(".")
+    first = next(bpm_paths, None)
     
-    if not dsl_files:
+    if first is None:
         print("❌ No .bpm files found in project")
         return
     
-    print(f"📁 Found {len(dsl_files)} DSL files:")
-    for i, file_path in enumerate(dsl_files, 1):
-        print(f"   {i}. {file_path}")
+    if verbose:
+        dsl_files = [first, *bpm_paths]
+        parts = [f"📁 Found {len(dsl_files)} DSL files:"]
+        parts.extend(f"   {i}. {path}" for i, path in enumerate(dsl_files, 1))
+        sys.stdout.write("\n".join(parts) + "\n")
     
     # Process the first file
-    if dsl_files:
-        file_path = dsl_files[0]
-        print(f"\n🔄 Processing: {file_path}")
+    file_path = Path(first)
+    print(f"\n🔄 Processing: {file_path}")
+    
+    try:
+        process = parse_bpm_file(file_path)
+        print(f"✅ Parsed: {process.name}")
         
-        try:
-            process = parse_bpm_file(file_path)
-            print(f"✅ Parsed: {process.name}")
-            
-            # Validate
-            validator = ProcessValidator()
-            result = validator.validate(process)
-            status = "✅ VALID" if result.is_valid else "❌ INVALID"
-            print(f"🔍 Validation: {status}")
-            
-            # Generate BPMN
-            generator = BPMNGenerator()
-            output_file = file_path.with_suffix('.bpmn')
-            generator.save_to_file(process, str(output_file))
-            print(f"💾 Generated: {output_file}")
-            
-        except Exception as e:
-            print(f"❌ Error processing {file_path}: {e}")
+        # Validate
+        result = _VALIDATOR.validate(process)
+        status = "✅ VALID" if result.is_valid else "❌ INVALID"
+        print(f"🔍 Validation: {status}")
+        
+        # Generate BPMN
+        output_file = first[:-len('.bpm')] + '.bpmn'
+        _GENERATOR.generate_to_file(process, output_file)
+        print(f"💾 Generated: {output_file}")
+        
+    except Exception as e:
+        print(f"❌ Error processing {file_path}: {e}")
 
 
 def demo_cli_usage():
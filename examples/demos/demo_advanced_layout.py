@@ -8,19 +8,19 @@ intelligent edge routing.
 """
 
 import sys
+import traceback
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
 
-from bpm_dsl.parser import BPMParser
+from bpm_dsl.parser import parse_bpm_string
 from bpm_dsl.bpmn_generator import BPMNGenerator
 from bpm_dsl.layout_engine import LayoutConfig
 
+# Shared generator for the demos that use the default layout
+_GENERATOR = BPMNGenerator()
 
-def demo_simple_process():
-    """Demo a simple linear process."""
-    print("=== Demo 1: Simple Linear Process ===")
-    
-    dsl_content = '''
+# Linear process for demo_simple_process
+_DSL_SIMPLE = '''
     process "Simple Order Process" {
         id: "simple-order"
         version: "1.0"
@@ -54,29 +54,9 @@ def demo_simple_process():
         }
     }
     '''
-    
-    # Parse and generate
-    parser = BPMParser()
-    process = parser.parse_string(dsl_content)
-    
-    generator = BPMNGenerator()
-    bpmn_xml = generator.generate(process)
-    
-    # Save to file
-    with open('demo_simple_layout.bpmn', 'w') as f:
-        f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
-        f.write(bpmn_xml)
-    
-    print("✅ Generated: demo_simple_layout.bpmn")
-    print("   - Linear layout with proper spacing")
-    print("   - Optimized edge routing")
-
 
-def demo_gateway_process():
-    """Demo a process with gateway branches."""
-    print("\n=== Demo 2: Process with Gateway Branches ===")
-    
-    dsl_content = '''
+# Branching process for demo_gateway_process
+_DSL_GATEWAY = '''
     process "Order Approval Process" {
         id: "order-approval"
         version: "1.0"
@@ -137,36 +117,9 @@ def demo_gateway_process():
         }
     }
     '''
-    
-    # Parse and generate
-    parser = BPMParser()
-    process = parser.parse_string(dsl_content)
-    
-    generator = BPMNGenerator()
-    bpmn_xml = generator.generate(process)
-    
-    # Save to file
-    with open('demo_gateway_layout.bpmn', 'w') as f:
-        f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
-        f.write(bpmn_xml)
-    
-    print("✅ Generated: demo_gateway_layout.bpmn")
-    print("   - Gateway branches properly spaced vertically")
-    print("   - Merge gateway positioned correctly")
-    print("   - Conditional flows with proper routing")
-
 
-def demo_custom_layout_config():
-    """Demo with custom layout configuration."""
-    print("\n=== Demo 3: Custom Layout Configuration ===")
-    
-    # Create custom layout config
-    custom_config = LayoutConfig()
-    custom_config.SPACING['horizontal'] = 200  # More horizontal spacing
-    custom_config.SPACING['vertical'] = 120    # More vertical spacing
-    custom_config.SPACING['gateway_branch'] = 150  # More branch spacing
-    
-    dsl_content = '''
+# Review process laid out with a custom config
+_DSL_DOCUMENT_REVIEW = '''
     process "Document Review" {
         id: "doc-review"
         version: "1.0"
@@ -230,18 +183,57 @@ def demo_custom_layout_config():
         }
     }
     '''
+
+
+def demo_simple_process():
+    """Demo a simple linear process."""
+    print("=== Demo 1: Simple Linear Process ===")
+    
+    # Parse and generate
+    process = parse_bpm_string(_DSL_SIMPLE)
+    
+    _GENERATOR.generate_to_file(process, 'demo_simple_layout.bpmn')
+    
+    print("✅ Generated: demo_simple_layout.bpmn")
+    print("   - Linear layout with proper spacing")
+    print("   - Optimized edge routing")
+
+
+def demo_gateway_process():
+    """Demo a process with gateway branches."""
+    print("\n=== Demo 2: Process with Gateway Branches ===")
+    
+    # Parse and generate
+    process = parse_bpm_string(_DSL_GATEWAY)
+    
+    _GENERATOR.generate_to_file(process, 'demo_gateway_layout.bpmn')
+    
+    print("✅ Generated: demo_gateway_layout.bpmn")
+    print("   - Gateway branches properly spaced vertically")
+    print("   - Merge gateway positioned correctly")
+    print("   - Conditional flows with proper routing")
+
+
+def demo_custom_layout_config():
+    """Demo with custom layout configuration."""
+    print("\n=== Demo 3: Custom Layout Configuration ===")
+    
+    # Create custom layout config
+    # SPACING is a class-level dict, so give this instance its own copy
+    # rather than changing the defaults for every later layout
+    custom_config = LayoutConfig()
+    custom_config.SPACING = {
+        **LayoutConfig.SPACING,
+        'horizontal': 200,  # More horizontal spacing
+        'vertical': 120,    # More vertical spacing
+        'gateway_branch': 150,  # More branch spacing
+    }
     
     # Parse and generate with custom config
-    parser = BPMParser()
-    process = parser.parse_string(dsl_content)
+    process = parse_bpm_string(_DSL_DOCUMENT_REVIEW)
     
     generator = BPMNGenerator(layout_config=custom_config)
-    bpmn_xml = generator.generate(process)
-    
-    # Save to file
-    with open('demo_custom_layout.bpmn', 'w') as f:
-        f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
-        f.write(bpmn_xml)
+    generator.generate_to_file(process, 'demo_custom_layout.bpmn')
     
     print("✅ Generated: demo_custom_layout.bpmn")
     print("   - Custom spacing configuration applied")
@@ -250,39 +242,37 @@ def demo_custom_layout_config():
 
 def analyze_layout_features():
     """Analyze and explain the layout algorithm features."""
-    print("\n=== Layout Algorithm Features ===")
-    print("🔧 STRUCTURAL ANALYSIS:")
-    print("   • Builds process graph with adjacency lists")
-    print("   • Identifies start/end events, gateways, and decision points")
-    print("   • Detects parallel branches and potential loops")
-    
-    print("\n📐 LEVEL ASSIGNMENT:")
-    print("   • Uses modified topological sort for horizontal positioning")
-    print("   • Handles cycles and back-edges gracefully")
-    print("   • Ensures proper flow direction (left to right)")
-    
-    print("\n🎯 ELEMENT POSITIONING:")
-    print("   • Groups elements into hierarchical levels")
-    print("   • Centers elements vertically within levels")
-    print("   • Applies consistent spacing based on element types")
-    
-    print("\n🔀 GATEWAY HANDLING:")
-    print("   • Detects splitting and merging gateways")
-    print("   • Positions branches with appropriate vertical spacing")
-    print("   • Maintains visual clarity for decision flows")
-    
-    print("\n🛤️  EDGE ROUTING:")
-    print("   • Calculates optimal waypoints for connections")
-    print("   • Uses orthogonal routing for complex paths")
-    print("   • Avoids overlaps and maintains readability")
-    
-    print("\n⚙️  CONFIGURATION:")
-    print("   • Customizable spacing and dimensions")
-    print("   • Element-type-specific sizing")
-    print("   • Configurable margins and layout parameters")
+    sys.stdout.write("\n".join([
+        "\n=== Layout Algorithm Features ===",
+        "🔧 STRUCTURAL ANALYSIS:",
+        "   • Builds process graph with adjacency lists",
+        "   • Identifies start/end events, gateways, and decision points",
+        "   • Detects parallel branches and potential loops",
+        "\n📐 LEVEL ASSIGNMENT:",
+        "   • Uses modified topological sort for horizontal positioning",
+        "   • Handles cycles and back-edges gracefully",
+        "   • Ensures proper flow direction (left to right)",
+        "\n🎯 ELEMENT POSITIONING:",
+        "   • Groups elements into hierarchical levels",
+        "   • Centers elements vertically within levels",
+        "   • Applies consistent spacing based on element types",
+        "\n🔀 GATEWAY HANDLING:",
+        "   • Detects splitting and merging gateways",
+        "   • Positions branches with appropriate vertical spacing",
+        "   • Maintains visual clarity for decision flows",
+        "\n🛤️  EDGE ROUTING:",
+        "   • Calculates optimal waypoints for connections",
+        "   • Uses orthogonal routing for complex paths",
+        "   • Avoids overlaps and maintains readability",
+        "\n⚙️  CONFIGURATION:",
+        "   • Customizable spacing and dimensions",
+        "   • Element-type-specific sizing",
+        "   • Configurable margins and layout parameters",
+    ]) + "\n")
 
 
-if __name__ == "__main__":
+def main():
+    """Run all layout demos."""
     print("🎨 Advanced BPMN Layout Algorithm Demonstration")
     print("=" * 50)
     
@@ -301,5 +291,8 @@ if __name__ == "__main__":
         
     except Exception as e:
         print(f"❌ Error during demo: {e}")
-        import traceback
         traceback.print_exc()
+
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,9 @@ Demo script for otherwise flow functionality in BPM DSL.
 Shows how to use otherwise flows with gateways.
 """
 
+import re
 import sys
+import traceback
 from pathlib import Path
 
 # Add src to path
@@ -14,6 +16,17 @@ from bpm_dsl.parser import parse_bpm_string
 from bpm_dsl.bpmn_generator import BPMNGenerator
 from bpm_dsl.validator import ProcessValidator
 
+# Shared instances; neither keeps state between runs
+_VALIDATOR = ProcessValidator()
+_GENERATOR = BPMNGenerator()
+
+# Only gateway start tags can carry the default-flow attribute
+_DEFAULT_GATEWAY_RE = re.compile(rb'<exclusiveGateway\b[^>]*\bdefault=')
+
+# Declaration prepended to every generated BPMN file
+_XML_HEADER = b'<?xml version="1.0" encoding="UTF-8"?>\n'
+
+
 def main():
     print("🚀 BPM DSL Default Flow Demo")
     print("=" * 50)
@@ -33,8 +46,7 @@ def main():
         
         # Validate the process
         print("\n🔍 Validating process...")
-        validator = ProcessValidator()
-        validation_result = validator.validate(process)
+        validation_result = _VALIDATOR.validate(process)
         
         if validation_result.is_valid:
             print("✅ Process validation passed")
@@ -45,22 +57,21 @@ def main():
             return
         
         # Show flow analysis
-        print("\n📊 Flow Analysis:")
+        parts = ["\n📊 Flow Analysis:"]
         for flow in process.flows:
             flow_type = "DEFAULT" if flow.is_default else "CONDITIONAL" if flow.condition else "UNCONDITIONAL"
             condition_text = f" (condition: {flow.condition})" if flow.condition else ""
             default_flag = f" (is_default: {flow.is_default})" if hasattr(flow, 'is_default') else ""
-            print(f"  {flow.source_id} -> {flow.target_id} [{flow_type}]{condition_text}{default_flag}")
+            parts.append(f"  {flow.source_id} -> {flow.target_id} [{flow_type}]{condition_text}{default_flag}")
+        sys.stdout.write("\n".join(parts) + "\n")
         
         # Generate BPMN
         print("\n🔧 Generating BPMN XML...")
-        generator = BPMNGenerator()
-        bpmn_xml = generator.generate(process)
+        bpmn_xml = _GENERATOR.generate_bytes(process)
         
         # Save the generated BPMN
         output_file = "examples/default_flow_demo.bpmn"
-        with open(output_file, 'w') as f:
-            f.write(bpmn_xml)
+        Path(output_file).write_bytes(_XML_HEADER + bpmn_xml)
         
         print(f"✅ BPMN XML generated and saved to {output_file}")
         
@@ -68,13 +79,13 @@ def main():
         print("\n📋 Key BPMN Elements:")
         
         # Check for default flow attribute in gateway
-        if 'default=' in bpmn_xml:
+        if _DEFAULT_GATEWAY_RE.search(bpmn_xml):
             print("✅ Default flow attribute found in gateway")
         else:
             print("❌ Default flow attribute not found")
             
         # Check for condition expressions
-        condition_count = bpmn_xml.count('<conditionExpression')
+        condition_count = bpmn_xml.count(b'<conditionExpression')
         print(f"✅ Found {condition_count} conditional flow(s)")
         
         print("\n🎉 Demo completed successfully!")
@@ -83,7 +94,6 @@ def main():
         
     except Exception as e:
         print(f"❌ Error: {e}")
-        import traceback
         traceback.print_exc()
 
 if __name__ == "__main__":
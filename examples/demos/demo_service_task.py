@@ -8,6 +8,8 @@ This script demonstrates:
 3. Validating the generated XML structure
 """
 
+import io
+import re
 import sys
 import os
 from pathlib import Path
@@ -20,6 +22,16 @@ from bpm_dsl.bpmn_generator import BPMNGenerator
 from bpm_dsl.validator import ProcessValidator
 from bpm_dsl.ast_nodes import ServiceTask
 
+# Shared instances; neither keeps state between runs
+_VALIDATOR = ProcessValidator()
+_GENERATOR = BPMNGenerator()
+
+# Matches one complete <serviceTask>...</serviceTask> block in generated XML
+_SERVICE_TASK_RE = re.compile(r'<serviceTask\b[^>]*>.*?</serviceTask>', re.DOTALL)
+
+# Declaration prepended to every generated BPMN file
+_XML_HEADER = b'<?xml version="1.0" encoding="UTF-8"?>\n'
+
 
 def main():
     """Run the serviceTask demo."""
@@ -45,11 +57,11 @@ def main():
         for task in service_tasks:
             print(f"   • {task.name} (type: {task.task_type}, retries: {task.retries})")
             if task.headers:
-                print(f"     Headers: {[(h.key, h.value) for h in task.headers]}")
+                print(f"     Headers: {', '.join(f'{h.key}={h.value}' for h in task.headers)}")
             if task.input_mappings:
-                print(f"     Input vars: {[m.source for m in task.input_mappings]}")
+                print(f"     Input vars: {', '.join(m.source for m in task.input_mappings)}")
             if task.output_mappings:
-                print(f"     Output vars: {[m.target for m in task.output_mappings]}")
+                print(f"     Output vars: {', '.join(m.target for m in task.output_mappings)}")
         
     except Exception as e:
         print(f"❌ Parse error: {e}")
@@ -58,39 +70,25 @@ def main():
     # Generate BPMN XML
     print("\n🏗️  Generating BPMN XML...")
     try:
-        generator = BPMNGenerator()
-        xml_content = generator.generate(process)
+        xml_content = _GENERATOR.generate(process)
         
         # Save to file
         output_file = Path("examples/service_task_demo.bpmn")
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
-            f.write(xml_content)
+        output_file.write_bytes(_XML_HEADER + xml_content.encode('utf-8'))
         
         print(f"✅ Generated BPMN XML: {output_file}")
         
         # Show key XML snippets
         print("\n📋 Key XML Elements:")
-        lines = xml_content.split('\n')
-        
-        # Find serviceTask elements
-        in_service_task = False
-        service_task_lines = []
-        
-        for line in lines:
-            if '<serviceTask' in line:
-                in_service_task = True
-                service_task_lines = [line]
-            elif in_service_task:
-                service_task_lines.append(line)
-                if '</serviceTask>' in line:
-                    # Print this serviceTask
-                    print("   ServiceTask XML:")
-                    for task_line in service_task_lines:
-                        print(f"     {task_line.strip()}")
-                    print()
-                    in_service_task = False
-                    service_task_lines = []
+        buf = io.StringIO()
+        for match in _SERVICE_TASK_RE.finditer(xml_content):
+            buf.write("   ServiceTask XML:\n")
+            for task_line in match.group(0).split('\n'):
+                buf.write("     ")
+                buf.write(task_line.lstrip())
+                buf.write("\n")
+            buf.write("\n")
+        sys.stdout.write(buf.getvalue())
         
     except Exception as e:
         print(f"❌ Generation error: {e}")
@@ -99,8 +97,7 @@ def main():
     # Validate the process
     print("🔍 Validating process...")
     try:
-        validator = ProcessValidator()
-        validation_result = validator.validate(process)
+        validation_result = _VALIDATOR.validate(process)
         
         if validation_result.is_valid:
             print("✅ Process validation passed!")
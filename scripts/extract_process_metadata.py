@@ -11,37 +11,96 @@ This script parses .bpm files to extract:
 Generates process-mappings.json for runtime process discovery.
 """
 
+import contextlib
+import io
+import itertools
 import os
 import sys
 import json
+import re
 import yaml
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from bpm_dsl.parser import parse_bpm_file
-from bpm_dsl.ast_nodes import ProcessEntity
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Prefer the libyaml-backed loader; fall back to pure Python when unavailable
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Line patterns for the conventional 2-space OpenAPI layout, used to find the
+# first POST path without building the whole document
+_PATHS_KEY_RE = re.compile(rb'^paths:[ \t]*\r?$', re.M)
+_TOP_LEVEL_KEY_RE = re.compile(rb'^[^\s#]', re.M)
+_PATH_KEY_RE = re.compile(rb'^  (/[^:\s]*):[ \t]*\r?$', re.M)
+# Any key at path depth; each must also be a plain path key for the scan to hold
+_PATH_DEPTH_RE = re.compile(rb'^  \S', re.M)
+_POST_KEY_RE = re.compile(rb'^    post:', re.M)
+# Path items the line scan cannot read reliably (merge keys, refs, anchors, flow style)
+_AMBIGUOUS_RE = re.compile(rb'^    (?:<<|\$ref|\S[^\n]*[&*{])', re.M)
+
+# Extracted POST endpoints, keyed by absolute YAML path, kept next to the output file
+ENDPOINT_CACHE_NAME = ".endpoint_cache.json"
+
+# Below this many files a worker pool costs more to start than it saves
+PARALLEL_MIN_FILES = 4
 
 
 def find_yaml_file(bpm_file_path: Path) -> Optional[Path]:
     """Find the paired OpenAPI YAML file for a .bpm file."""
-    yaml_path = bpm_file_path.with_suffix('.yaml')
-    yml_path = bpm_file_path.with_suffix('.yml')
-    
-    if yaml_path.exists():
-        return yaml_path
-    elif yml_path.exists():
-        return yml_path
+    base, _ = os.path.splitext(os.fspath(bpm_file_path))
+    for suffix in ('.yaml', '.yml'):
+        candidate = base + suffix
+        if os.path.exists(candidate):
+            return Path(candidate)
+    return None
+
+
+def _find_post_endpoint_fast(data: bytes) -> Optional[str]:
+    """Scan raw YAML lines for the first path with a POST method.
+
+    Returns None whenever the layout is not the plain 2-space form, so the
+    caller can fall back to a full YAML parse.
+    """
+    paths = _PATHS_KEY_RE.search(data)
+    if not paths:
+        return None
+    next_key = _TOP_LEVEL_KEY_RE.search(data, paths.end())
+    section_end = next_key.start() if next_key else len(data)
+
+    path_keys = list(_PATH_KEY_RE.finditer(data, paths.end(), section_end))
+    # A quoted or commented key would be folded into the previous path's block
+    path_depth_lines = _PATH_DEPTH_RE.findall(data, paths.end(), section_end)
+    if len(path_depth_lines) != len(path_keys):
+        return None
+    for i, path_key in enumerate(path_keys):
+        block_end = path_keys[i + 1].start() if i + 1 < len(path_keys) else section_end
+        if _AMBIGUOUS_RE.search(data, path_key.end(), block_end):
+            return None
+        if _POST_KEY_RE.search(data, path_key.end(), block_end):
+            return path_key.group(1).decode('utf-8')
     return None
 
 
 def extract_post_endpoint_from_yaml(yaml_file_path: Path) -> Optional[str]:
     """Extract the POST endpoint path from OpenAPI YAML file."""
     try:
-        with open(yaml_file_path, 'r') as f:
-            spec = yaml.safe_load(f)
+        with open(yaml_file_path, 'rb') as f:
+            data = f.read()
+        
+        endpoint = _find_post_endpoint_fast(data)
+        if endpoint:
+            return endpoint
+        
+        spec = yaml.load(data, Loader=YAML_LOADER)
         
         # Find the first POST endpoint in paths
         if 'paths' in spec:
@@ -55,22 +114,67 @@ def extract_post_endpoint_from_yaml(yaml_file_path: Path) -> Optional[str]:
         return None
 
 
+def _load_endpoint_cache(cache_path: Path) -> Dict:
+    """Load the endpoint cache, treating a missing or corrupt file as empty."""
+    try:
+        data = cache_path.read_bytes()
+        cache = orjson.loads(data) if orjson is not None else json.loads(data)
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def _save_endpoint_cache(cache_path: Path, cache: Dict) -> None:
+    """Write the endpoint cache; failing to do so only costs the next run time."""
+    data = orjson.dumps(cache) if orjson is not None else json.dumps(cache).encode('utf-8')
+    try:
+        cache_path.write_bytes(data)
+    except OSError as e:
+        print(f"Warning: Could not write endpoint cache {cache_path}: {e}")
+
+
+def get_post_endpoint(yaml_file_path: Path, cache: Optional[Dict] = None) -> Optional[str]:
+    """Return the POST endpoint for a YAML file, reusing cached results.
+
+    Cache entries are ``[mtime_ns, size, endpoint]`` and are only trusted
+    while the file's modification time and size are unchanged.
+    """
+    if cache is None:
+        return extract_post_endpoint_from_yaml(yaml_file_path)
+    
+    key = os.path.abspath(yaml_file_path)
+    stat = os.stat(key)
+    entry = cache.get(key)
+    if entry and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+        return entry[2]
+    
+    endpoint = extract_post_endpoint_from_yaml(yaml_file_path)
+    if endpoint:
+        cache[key] = [stat.st_mtime_ns, stat.st_size, endpoint]
+    return endpoint
+
+
 def extract_entity_name_from_process(process) -> Optional[str]:
     """Extract entity name from processEntity element in the process."""
-    for element in process.elements:
-        if isinstance(element, ProcessEntity):
-            return element.entity_name
-    return None
+    entity = process.process_entity
+    return entity.entity_name if entity else None
 
 
-def extract_metadata_from_bpm(bpm_file_path: Path) -> Optional[Dict]:
-    """Extract metadata from a single .bpm file."""
+def extract_metadata_from_bpm(bpm_file_path: Path,
+                              endpoint_cache: Optional[Dict] = None,
+                              yaml_file: Optional[Path] = None) -> Optional[Dict]:
+    """Extract metadata from a single .bpm file.
+
+    ``yaml_file`` may carry the pairing already found by a directory scan;
+    otherwise the paired YAML file is looked up on disk.
+    """
     try:
         # Parse the .bpm file
         process = parse_bpm_file(str(bpm_file_path))
         
         # Find paired YAML file
-        yaml_file = find_yaml_file(bpm_file_path)
+        if yaml_file is None:
+            yaml_file = find_yaml_file(bpm_file_path)
         if not yaml_file:
             print(f"Warning: No paired YAML file found for {bpm_file_path}")
             return None
@@ -82,7 +186,7 @@ def extract_metadata_from_bpm(bpm_file_path: Path) -> Optional[Dict]:
             return None
         
         # Extract POST endpoint from YAML
-        post_endpoint = extract_post_endpoint_from_yaml(yaml_file)
+        post_endpoint = get_post_endpoint(yaml_file, endpoint_cache)
         if not post_endpoint:
             print(f"Warning: No POST endpoint found in {yaml_file}")
             return None
@@ -105,38 +209,107 @@ def extract_metadata_from_bpm(bpm_file_path: Path) -> Optional[Dict]:
         return None
 
 
+def scan_directory_for_bpm_pairs(directory: Path) -> List[Tuple[Path, Optional[Path]]]:
+    """Recursively scan directory for .bpm files paired with their OpenAPI YAML.
+
+    Sibling .yaml/.yml files are collected from the same directory listing,
+    so pairing costs no extra stat() calls. A .yaml file wins over a .yml
+    file, as in find_yaml_file.
+    """
+    pairs = []
+    stack = [str(directory)]
+    while stack:
+        bpm_paths = []
+        yaml_paths = {}
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                name = entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif name.endswith('.bpm'):
+                    bpm_paths.append(entry.path)
+                elif name.endswith('.yaml'):
+                    yaml_paths[name[:-5]] = entry.path
+                elif name.endswith('.yml'):
+                    yaml_paths.setdefault(name[:-4], entry.path)
+        for bpm_path in bpm_paths:
+            yaml_path = yaml_paths.get(os.path.basename(bpm_path)[:-4])
+            pairs.append((Path(bpm_path), Path(yaml_path) if yaml_path else None))
+    return sorted(pairs)
+
+
 def scan_directory_for_bpm_files(directory: Path) -> List[Path]:
     """Recursively scan directory for .bpm files."""
-    bpm_files = []
-    for file_path in directory.rglob("*.bpm"):
-        bpm_files.append(file_path)
-    return sorted(bpm_files)
+    return [bpm_file for bpm_file, _ in scan_directory_for_bpm_pairs(directory)]
+
+
+def _dump_mappings(mappings: Dict) -> bytes:
+    """Serialize mappings as 2-space indented UTF-8 JSON, via orjson when installed.
+
+    Non-ASCII text is written as UTF-8 rather than ``\\u`` escapes on both
+    paths. A process without an id is keyed ``"null"``, as ``json`` does.
+    """
+    if orjson is not None:
+        return orjson.dumps(mappings, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(mappings, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def _extract_with_log(pair: Tuple[Path, Optional[Path]],
+                      endpoint_cache: Dict) -> Tuple[Optional[Dict], str, Dict]:
+    """Extract metadata for one file, capturing its printed warnings.
+
+    Runs in worker processes, so the output and the (possibly updated)
+    endpoint cache are handed back for the parent to replay and merge.
+    """
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log):
+        metadata = extract_metadata_from_bpm(pair[0], endpoint_cache, pair[1])
+    return metadata, log.getvalue(), endpoint_cache
 
 
 def generate_process_mappings(root_dir: Path, output_file: Path) -> Dict:
     """Generate process mappings JSON from all .bpm files in directory."""
     print(f"Scanning {root_dir} for .bpm files...")
     
-    bpm_files = scan_directory_for_bpm_files(root_dir)
-    print(f"Found {len(bpm_files)} .bpm file(s)")
+    bpm_pairs = scan_directory_for_bpm_pairs(root_dir)
+    print(f"Found {len(bpm_pairs)} .bpm file(s)")
     
     mappings = {}
+    cache_path = output_file.parent / ENDPOINT_CACHE_NAME
+    endpoint_cache = _load_endpoint_cache(cache_path)
     
-    for bpm_file in bpm_files:
-        print(f"\nProcessing: {bpm_file.name}")
-        metadata = extract_metadata_from_bpm(bpm_file)
+    with contextlib.ExitStack() as stack:
+        if len(bpm_pairs) < PARALLEL_MIN_FILES:
+            results = (_extract_with_log(pair, endpoint_cache) for pair in bpm_pairs)
+        else:
+            executor = stack.enter_context(ProcessPoolExecutor())
+            results = executor.map(_extract_with_log, bpm_pairs,
+                                   itertools.repeat(endpoint_cache), chunksize=4)
         
-        if metadata:
-            process_id = metadata["processId"]
-            mappings[process_id] = metadata
-            print(f"  ✓ Process ID: {process_id}")
-            print(f"  ✓ Entity: {metadata['entityName']}")
-            print(f"  ✓ Endpoint: {metadata['postEndpoint']}")
+        # Results arrive in file order, so the log reads the same either way;
+        # it is collected and written in one go rather than a print per line
+        report = []
+        for (bpm_file, _), (metadata, log, worker_cache) in zip(bpm_pairs, results):
+            report.append(f"\nProcessing: {bpm_file.name}\n")
+            report.append(log)
+            endpoint_cache.update(worker_cache)
+            
+            if metadata:
+                process_id = metadata["processId"]
+                mappings[process_id] = metadata
+                report.append(
+                    f"  ✓ Process ID: {process_id}\n"
+                    f"  ✓ Entity: {metadata['entityName']}\n"
+                    f"  ✓ Endpoint: {metadata['postEndpoint']}\n"
+                )
+    sys.stdout.write("".join(report))
+    
+    _save_endpoint_cache(cache_path, endpoint_cache)
     
     # Write to output file
     print(f"\nWriting mappings to {output_file}...")
-    with open(output_file, 'w') as f:
-        json.dump(mappings, f, indent=2)
+    with open(output_file, 'wb') as f:
+        f.write(_dump_mappings(mappings))
     
     print(f"✓ Generated process mappings for {len(mappings)} process(es)")
     
@@ -3,8 +3,23 @@
 __version__ = "0.1.0"
 __author__ = "BPM DSL Team"
 
-from .parser import BPMParser
-from .bpmn_generator import BPMNGenerator
 from .ast_nodes import *
 
+# The parser imports lark and the generator imports lxml; load them on
+# first access so e.g. ``bpm-dsl --help`` does not pay for those imports
+_LAZY_EXPORTS = {
+    "BPMParser": ".parser",
+    "BPMNGenerator": ".bpmn_generator",
+}
+
+
+def __getattr__(name):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
 __all__ = ["BPMParser", "BPMNGenerator"]
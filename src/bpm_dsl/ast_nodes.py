@@ -1,41 +1,52 @@
 """Abstract Syntax Tree node definitions for the BPM DSL."""
 
-from dataclasses import dataclass
-from typing import List, Optional, Dict, Any
-from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import ClassVar, List, Optional, Dict
+from abc import ABC
 
 
-@dataclass
+@dataclass(slots=True)
 class ASTNode(ABC):
     """Base class for all AST nodes."""
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class Process(ASTNode):
     """Root process definition."""
     name: str
     id: str
     version: Optional[str] = None
-    elements: List['Element'] = None
-    flows: List['Flow'] = None
+    elements: List['Element'] = field(default_factory=list)
+    flows: List['Flow'] = field(default_factory=list)
     openapi_file_path: Optional[str] = None  # Path to the OpenAPI YAML file
-    
-    def __post_init__(self):
-        if self.elements is None:
-            self.elements = []
-        if self.flows is None:
-            self.flows = []
+
+    @property
+    def process_entity(self) -> Optional['ProcessEntity']:
+        """First processEntity in elements, or None.
+
+        Computed on access so elements appended after construction are seen.
+        """
+        for element in self.elements:
+            if element._kind == 'process_entity':
+                return element
+        return None
 
 
-@dataclass
+@dataclass(slots=True)
 class Element(ASTNode):
-    """Base class for process elements."""
+    """Base class for process elements.
+
+    ``_kind`` is a class-level tag naming the concrete element type, so hot
+    loops can filter with a string compare instead of ``isinstance``.
+    """
+    _kind: ClassVar[str] = 'element'
+
     name: str
     id: str
 
 
-@dataclass
+@dataclass(slots=True)
 class TimerDefinition(ASTNode):
     """Timer configuration for timer events and timer start events.
 
@@ -47,7 +58,7 @@ class TimerDefinition(ASTNode):
     cycle: Optional[str] = None     # e.g., "R/PT1H"
 
 
-@dataclass
+@dataclass(slots=True)
 class StartEvent(Element):
     """Start event element.
 
@@ -56,48 +67,48 @@ class StartEvent(Element):
     When message is set, this becomes a message start event that triggers
     when the named message is published to Zeebe.
     """
+    _kind: ClassVar[str] = 'start_event'
+
     timer: Optional[TimerDefinition] = None
     message: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class EndEvent(Element):
     """End event element."""
-    pass
+    _kind: ClassVar[str] = 'end_event'
 
 
-@dataclass
+@dataclass(slots=True)
 class VariableMapping(ASTNode):
     """Variable mapping from source to target."""
     source: str
     target: str
 
 
-@dataclass
+@dataclass(slots=True)
 class ScriptCall(Element):
     """Script call task element."""
+    _kind: ClassVar[str] = 'script_call'
+
     script: str
-    input_mappings: Optional[List[VariableMapping]] = None
-    output_mappings: Optional[List[VariableMapping]] = None
+    input_mappings: List[VariableMapping] = field(default_factory=list)
+    output_mappings: List[VariableMapping] = field(default_factory=list)
     result_variable: Optional[str] = None
     
     def __post_init__(self):
-        if self.input_mappings is None:
-            self.input_mappings = []
-        if self.output_mappings is None:
-            self.output_mappings = []
         if self.result_variable is None:
             self.result_variable = "result"
 
 
-@dataclass
+@dataclass(slots=True)
 class TaskHeader(ASTNode):
     """Task header key-value pair for service tasks."""
     key: str
     value: str
 
 
-@dataclass
+@dataclass(slots=True)
 class BoundaryEvent(Element):
     """Base class for boundary events attached to a task element.
 
@@ -105,46 +116,56 @@ class BoundaryEvent(Element):
     rendered as sibling elements in BPMN with an attachedToRef back to
     the parent task.
     """
+    _kind: ClassVar[str] = 'boundary_event'
+
     attached_to_ref: Optional[str] = None  # ID of the parent task element
     interrupting: bool = True              # cancelActivity in BPMN
 
 
-@dataclass
+@dataclass(slots=True)
 class BoundaryTimerEvent(BoundaryEvent):
     """Boundary timer event (onTimer) attached to a service task.
 
     Triggers after a duration elapses while the parent task is active.
     """
+    _kind: ClassVar[str] = 'boundary_timer_event'
+
     duration: Optional[str] = None  # ISO 8601 duration, e.g., "PT5M"
 
 
-@dataclass
+@dataclass(slots=True)
 class BoundaryErrorEvent(BoundaryEvent):
     """Boundary error event (onError) attached to a service task.
 
     Catches BPMN errors thrown by the parent task.
     """
+    _kind: ClassVar[str] = 'boundary_error_event'
+
     error_code: Optional[str] = None  # e.g., "API_ERROR"
 
 
-@dataclass
+@dataclass(slots=True)
 class BoundaryMessageEvent(BoundaryEvent):
     """Boundary message event (onMessage) attached to a service task.
 
     Catches messages correlated to the running process instance while
     the parent task is active.
     """
+    _kind: ClassVar[str] = 'boundary_message_event'
+
     message: str = ""
     correlation_key: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class TimerEvent(Element):
     """Timer intermediate catch event.
 
     A standalone timer that pauses the process flow for a specified
     duration, until a date, or on a cycle.
     """
+    _kind: ClassVar[str] = 'timer_event'
+
     timer: Optional[TimerDefinition] = None
 
     def __post_init__(self):
@@ -152,7 +173,7 @@ class TimerEvent(Element):
             self.timer = TimerDefinition()
 
 
-@dataclass
+@dataclass(slots=True)
 class ReceiveMessageEvent(Element):
     """Receive message intermediate catch event.
 
@@ -160,11 +181,13 @@ class ReceiveMessageEvent(Element):
     published and correlated via the correlation key (a FEEL expression
     referencing a process variable).
     """
+    _kind: ClassVar[str] = 'receive_message_event'
+
     message: str = ""
     correlation_key: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class ServiceTask(Element):
     """Service task element for external job workers.
 
@@ -172,12 +195,14 @@ class ServiceTask(Element):
     over a collection variable.  When forEach is set, the BPMN generator
     emits a <multiInstanceLoopCharacteristics> child element.
     """
+    _kind: ClassVar[str] = 'service_task'
+
     task_type: str
     retries: Optional[int] = None
-    headers: Optional[List[TaskHeader]] = None
-    input_mappings: Optional[List[VariableMapping]] = None
-    output_mappings: Optional[List[VariableMapping]] = None
-    boundary_events: Optional[List[BoundaryEvent]] = None
+    headers: List[TaskHeader] = field(default_factory=list)
+    input_mappings: List[VariableMapping] = field(default_factory=list)
+    output_mappings: List[VariableMapping] = field(default_factory=list)
+    boundary_events: List[BoundaryEvent] = field(default_factory=list)
     for_each: Optional[str] = None   # collection variable (FEEL expression)
     as_var: Optional[str] = None     # loop element variable name
     parallel: bool = False           # sequential (default) vs parallel
@@ -185,17 +210,9 @@ class ServiceTask(Element):
     def __post_init__(self):
         if self.retries is None:
             self.retries = 3
-        if self.headers is None:
-            self.headers = []
-        if self.input_mappings is None:
-            self.input_mappings = []
-        if self.output_mappings is None:
-            self.output_mappings = []
-        if self.boundary_events is None:
-            self.boundary_events = []
 
 
-@dataclass
+@dataclass(slots=True)
 class Subprocess(Element):
     """Embedded subprocess that contains its own elements and flow.
 
@@ -208,23 +225,17 @@ class Subprocess(Element):
     subprocess to iterate over a collection, executing the full
     embedded flow once per item.
     """
-    elements: Optional[List[Element]] = None
-    flows: Optional[List['Flow']] = None
-    boundary_events: Optional[List[BoundaryEvent]] = None
+    _kind: ClassVar[str] = 'subprocess'
+
+    elements: List[Element] = field(default_factory=list)
+    flows: List['Flow'] = field(default_factory=list)
+    boundary_events: List[BoundaryEvent] = field(default_factory=list)
     for_each: Optional[str] = None   # collection variable (FEEL expression)
     as_var: Optional[str] = None     # loop element variable name
     parallel: bool = False           # sequential (default) vs parallel
 
-    def __post_init__(self):
-        if self.elements is None:
-            self.elements = []
-        if self.flows is None:
-            self.flows = []
-        if self.boundary_events is None:
-            self.boundary_events = []
-
 
-@dataclass
+@dataclass(slots=True)
 class CallActivity(Element):
     """Call activity that invokes another process by its BPMN process ID.
 
@@ -232,18 +243,14 @@ class CallActivity(Element):
     separately-deployed process definition.  Input/output mappings
     control variable propagation between the calling and called process.
     """
-    process_id: str = ""
-    input_mappings: Optional[List[VariableMapping]] = None
-    output_mappings: Optional[List[VariableMapping]] = None
+    _kind: ClassVar[str] = 'call_activity'
 
-    def __post_init__(self):
-        if self.input_mappings is None:
-            self.input_mappings = []
-        if self.output_mappings is None:
-            self.output_mappings = []
+    process_id: str = ""
+    input_mappings: List[VariableMapping] = field(default_factory=list)
+    output_mappings: List[VariableMapping] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class ProcessEntity(Element):
     """Process entity element that translates to a serviceTask in Camunda.
 
@@ -253,12 +260,19 @@ class ProcessEntity(Element):
 
     The OpenAPI file path is automatically inferred from the process definition.
     """
+    _kind: ClassVar[str] = 'process_entity'
+
     entity_name: str   # Name of the entity
+    # IDs of the validation gateway/error end emitted by the BPMN generator;
+    # empty until the entity has been generated
+    _generated_elements: Dict[str, str] = field(default_factory=dict, init=False, repr=False, compare=False)
 
 
-@dataclass
+@dataclass(slots=True)
 class Gateway(Element):
     """Gateway element with configurable type (xor, parallel)."""
+    _kind: ClassVar[str] = 'gateway'
+
     gateway_type: str = "xor"
     condition: Optional[str] = None
 
@@ -267,7 +281,7 @@ class Gateway(Element):
 XORGateway = Gateway
 
 
-@dataclass
+@dataclass(slots=True)
 class Flow(ASTNode):
     """Sequence flow between elements."""
     source_id: str
@@ -276,7 +290,7 @@ class Flow(ASTNode):
     is_default: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class FlowCondition(ASTNode):
     """Flow condition expression."""
     expression: str
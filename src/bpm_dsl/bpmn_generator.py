@@ -1,9 +1,9 @@
 """BPMN XML generator for Zeebe compatibility."""
 
-import uuid
+import functools
+from collections import defaultdict
 from typing import Dict, List, Optional
-from xml.etree.ElementTree import Element, SubElement, tostring, ElementTree, register_namespace
-from xml.dom import minidom
+from lxml.etree import Element, SubElement, tostring, ElementTree
 
 from .ast_nodes import (
     Process, StartEvent, EndEvent, ScriptCall, ServiceTask, ProcessEntity, Gateway,
@@ -14,47 +14,140 @@ from .ast_nodes import (
 from .layout_engine import BPMNLayoutEngine, LayoutConfig, Bounds
 
 
+_NAMESPACES = {
+    'bpmn': 'http://www.omg.org/spec/BPMN/20100524/MODEL',
+    'bpmndi': 'http://www.omg.org/spec/BPMN/20100524/DI',
+    'dc': 'http://www.omg.org/spec/DD/20100524/DC',
+    'di': 'http://www.omg.org/spec/DD/20100524/DI',
+    'zeebe': 'http://camunda.org/schema/zeebe/1.0',
+    'xsi': 'http://www.w3.org/2001/XMLSchema-instance'
+}
+
+# BPMN model elements are written unprefixed under the default namespace
+_NSMAP = {None if prefix == 'bpmn' else prefix: uri for prefix, uri in _NAMESPACES.items()}
+
+# "{uri}" Clark prefixes, resolved once; '' maps to the default BPMN namespace
+_CLARK_PREFIXES = {prefix: f"{{{uri}}}" for prefix, uri in _NAMESPACES.items()}
+_CLARK_PREFIXES[''] = _CLARK_PREFIXES['bpmn']
+
+
+class _QualifiedTags(dict):
+    """``prefix:local`` -> Clark-notation tag, expanded once on first lookup."""
+
+    def __missing__(self, tag: str) -> str:
+        prefix, _, local = tag.rpartition(':')
+        qualified = self[tag] = _CLARK_PREFIXES[prefix] + local
+        return qualified
+
+
+# The generator only uses a few dozen distinct tags, so after warm-up every
+# element creation resolves its tag with a single dict hit
+_QUALIFIED_TAGS = _QualifiedTags()
+
+
+def _qname(tag: str) -> str:
+    """Expand a ``prefix:local`` tag (``bpmn`` when unprefixed) to Clark notation."""
+    return _QUALIFIED_TAGS[tag]
+
+
+_XSI_TYPE = _qname("xsi:type")
+
+_XML_DECLARATION = b'<?xml version="1.0" encoding="UTF-8"?>\n'
+
+# lxml hands the file ~4 KiB chunks; a large buffer turns those into few syscalls
+_WRITE_BUFFER_SIZE = 1 << 20
+
+
+@functools.lru_cache(maxsize=4096)
+def _to_feel(expression: str) -> str:
+    """Convert a DSL expression to FEEL; memoized since conditions repeat across flows."""
+    # Don't modify if already a FEEL expression
+    if expression.startswith('='):
+        return expression
+
+    # Convert JavaScript-style operators to FEEL operators: == becomes =
+    # (!= is already valid FEEL) and single-quoted literals become
+    # double-quoted. Chained str.replace stays in C and beats both a
+    # compiled regex with a callback and str.translate here.
+    feel_expression = expression.replace(' == ', ' = ').replace("'", '"')
+
+    return f'={feel_expression}'
+
+
+def _sub(parent: Element, tag: str, **attrs: str) -> Element:
+    """Create ``tag`` as a child of ``parent`` and set ``attrs`` in order.
+
+    Elements are always attached at creation time: appending detached
+    elements makes lxml merge documents, which goes quadratic on large diagrams.
+    """
+    child = SubElement(parent, _QUALIFIED_TAGS[tag])
+    # Individual set() calls beat lxml's attrib-dict argument, which
+    # re-validates each key through a slower generic path
+    for name, value in attrs.items():
+        child.set(name, value)
+    return child
+
+
+# Every diagram shape carries one dc:Bounds and every edge a run of
+# di:waypoint children; these fixed-shape nodes skip the generic _sub path
+_BOUNDS_TAG = _qname("dc:Bounds")
+_WAYPOINT_TAG = _qname("di:waypoint")
+
+
+def _add_bounds(shape: Element, x: float, y: float, width: float, height: float) -> None:
+    """Add a ``dc:Bounds`` child with coordinates truncated to integers."""
+    bounds = SubElement(shape, _BOUNDS_TAG)
+    bounds.set("x", "%d" % x)
+    bounds.set("y", "%d" % y)
+    bounds.set("width", "%d" % width)
+    bounds.set("height", "%d" % height)
+
+
+def _add_waypoint(edge: Element, x: float, y: float) -> None:
+    """Add a ``di:waypoint`` child with coordinates truncated to integers."""
+    waypoint = SubElement(edge, _WAYPOINT_TAG)
+    waypoint.set("x", "%d" % x)
+    waypoint.set("y", "%d" % y)
+
+
 class BPMNGenerator:
     """Generates BPMN XML from BPM DSL AST."""
     
     def __init__(self, layout_config: LayoutConfig = None):
         """Initialize the BPMN generator."""
-        self.namespaces = {
-            'bpmn': 'http://www.omg.org/spec/BPMN/20100524/MODEL',
-            'bpmndi': 'http://www.omg.org/spec/BPMN/20100524/DI',
-            'dc': 'http://www.omg.org/spec/DD/20100524/DC',
-            'di': 'http://www.omg.org/spec/DD/20100524/DI',
-            'zeebe': 'http://camunda.org/schema/zeebe/1.0',
-            'xsi': 'http://www.w3.org/2001/XMLSchema-instance'
-        }
+        self.namespaces = dict(_NAMESPACES)
         
         # Initialize layout engine
         self.layout_engine = BPMNLayoutEngine(layout_config)
         
-        # Track gateway elements for default flow assignment
-        self._gateway_elements = {}
-        
-        # Don't register namespaces - handle them manually to avoid duplicates
+        # Sequence flow IDs keyed by id() of their Flow node
+        self._flow_ids = {}
+        
+        # Default outgoing flow ID per exclusive gateway ID
+        self._default_flows = {}
+        
+        # Generated validation element IDs of the top-level processEntity elements
+        self._process_entities = {}
+        
+        # Element builders keyed by AST node type; subclasses resolve via MRO
+        self._element_dispatch = {
+            StartEvent: self._add_start_event,
+            EndEvent: self._add_end_event,
+            ScriptCall: self._add_script_task,
+            ServiceTask: self._add_service_task,
+            ProcessEntity: self._add_process_entity,
+            ReceiveMessageEvent: self._add_receive_message_event,
+            TimerEvent: self._add_timer_event,
+            Subprocess: self._add_subprocess,
+            CallActivity: self._add_call_activity,
+            Gateway: self._add_gateway,
+        }
     
     def _ensure_feel_expression(self, expression: str) -> str:
         """Ensure expression starts with '=' for FEEL compatibility and convert operators."""
         if not expression:
             return expression
-            
-        # Don't modify if already a FEEL expression
-        if expression.startswith('='):
-            return expression
-            
-        # Convert JavaScript-style operators to FEEL operators
-        feel_expression = expression
-        # Convert == to = for FEEL equality
-        feel_expression = feel_expression.replace(' == ', ' = ')
-        # Convert != to != (this should be fine in FEEL, but let's be explicit)
-        feel_expression = feel_expression.replace(' != ', ' != ')
-        # Convert single quotes to double quotes for FEEL string literals
-        feel_expression = feel_expression.replace("'", '"')
-        
-        return f'={feel_expression}'
+        return _to_feel(expression)
     
     def _collect_message_names(self, process: Process) -> List[str]:
         """Collect unique message names from all message events, preserving first-seen order."""
@@ -66,23 +159,22 @@ class BPMNGenerator:
     def _collect_message_names_recursive(self, elements: List, seen: set, names: list) -> None:
         """Recursively collect message names from elements, including inside subprocesses."""
         for element in elements:
+            kind = element._kind
             msg = None
-            if isinstance(element, StartEvent) and element.message:
-                msg = element.message
-            elif isinstance(element, ReceiveMessageEvent) and element.message:
+            if kind == 'start_event' or kind == 'receive_message_event':
                 msg = element.message
             if msg and msg not in seen:
                 seen.add(msg)
                 names.append(msg)
             # Check boundary events on service tasks and subprocesses
             boundary_events = []
-            if isinstance(element, ServiceTask):
+            if kind == 'service_task':
                 boundary_events = element.boundary_events or []
-            elif isinstance(element, Subprocess):
+            elif kind == 'subprocess':
                 boundary_events = element.boundary_events or []
                 self._collect_message_names_recursive(element.elements, seen, names)
             for be in boundary_events:
-                if isinstance(be, BoundaryMessageEvent) and be.message and be.message not in seen:
+                if be._kind == 'boundary_message_event' and be.message and be.message not in seen:
                     seen.add(be.message)
                     names.append(be.message)
 
@@ -90,66 +182,98 @@ class BPMNGenerator:
         """Recursively collect error definitions from boundary error events."""
         for elem in elements:
             boundary_events = []
-            if isinstance(elem, ServiceTask):
+            if elem._kind == 'service_task':
                 boundary_events = elem.boundary_events or []
-            elif isinstance(elem, Subprocess):
+            elif elem._kind == 'subprocess':
                 boundary_events = elem.boundary_events or []
                 self._collect_error_definitions(definitions, elem.elements, seen)
             for be in boundary_events:
-                if isinstance(be, BoundaryErrorEvent) and be.error_code:
+                if be._kind == 'boundary_error_event' and be.error_code:
                     if be.error_code not in seen:
                         seen.add(be.error_code)
-                        error_def = SubElement(definitions, "error")
-                        error_def.set("id", f"error-{be.error_code}")
-                        error_def.set("name", be.error_code)
-                        error_def.set("errorCode", be.error_code)
+                        _sub(definitions, "error", id=f"error-{be.error_code}",
+                             name=be.error_code, errorCode=be.error_code)
+
+    def _index_flows(self, process: Process) -> None:
+        """Name every sequence flow once and resolve gateway default flows.
+
+        Flow IDs are keyed by ``id()`` of the Flow node so flow and diagram
+        emission share one string per flow. Defaults are resolved up front so
+        gateways get their ``default`` attribute when they are created;
+        top-level processEntity flows make the success flow the default of
+        the generated validation gateway.
+        """
+        flow_ids = {}
+        defaults = {}
+        self._index_subprocess_flows(process.elements, flow_ids, defaults)
+
+        entity_ids = {e.id for e in process.elements if e._kind == 'process_entity'}
+        for flow in process.flows:
+            flow_id = flow_ids[id(flow)] = f"flow_{flow.source_id}_to_{flow.target_id}"
+            if flow.target_id not in entity_ids and flow.source_id in entity_ids:
+                validation_gateway_id = f"{flow.source_id}-validation-gateway"
+                defaults[validation_gateway_id] = f"flow_{validation_gateway_id}_to_{flow.target_id}"
+            elif flow.is_default:
+                defaults[flow.source_id] = flow_id
+
+        self._flow_ids = flow_ids
+        self._default_flows = defaults
+
+    def _index_subprocess_flows(self, elements: List, flow_ids: Dict[int, str],
+                                defaults: Dict[str, str]) -> None:
+        """Recursively index the flows declared inside subprocesses."""
+        for element in elements:
+            if element._kind == 'subprocess':
+                self._index_subprocess_flows(element.elements, flow_ids, defaults)
+                for flow in element.flows:
+                    flow_id = flow_ids[id(flow)] = f"flow_{flow.source_id}_to_{flow.target_id}"
+                    if flow.is_default:
+                        defaults[flow.source_id] = flow_id
 
     def generate(self, process: Process) -> str:
         """Generate BPMN XML from a Process AST."""
-        # Clear gateway elements for fresh generation
-        self._gateway_elements = {}
-        
         definitions = self._create_definitions(process)
         return self._prettify_xml(definitions)
+
+    def generate_bytes(self, process: Process) -> bytes:
+        """Generate BPMN XML from a Process AST as UTF-8 encoded bytes."""
+        definitions = self._create_definitions(process)
+        # lxml's serializer produces UTF-8 natively, so this skips building a
+        # str of the whole document only to encode it again
+        return tostring(definitions, encoding='utf-8', pretty_print=True)
     
     def _create_definitions(self, process: Process) -> Element:
         """Create the BPMN definitions element."""
-        # Create root definitions element without namespace prefix to avoid auto-prefixing
-        definitions = Element("definitions")
-        definitions.set("id", f"definitions_{process.id}")
-        definitions.set("targetNamespace", "http://bpmn.io/schema/bpmn")
-        definitions.set("exporter", "BPM DSL")
-        definitions.set("exporterVersion", "1.0")
-        
-        # Set all namespace declarations manually
-        definitions.set("xmlns", self.namespaces['bpmn'])
-        for prefix, uri in self.namespaces.items():
-            if prefix != 'bpmn':
-                definitions.set(f"xmlns:{prefix}", uri)
+        # Clear per-document state for fresh generation
+        self._index_flows(process)
+        self._process_entities = {}
+        
+        # All namespaces are declared on the root so descendants serialize with
+        # the familiar bpmndi:/dc:/di:/zeebe: prefixes
+        definitions = Element(_qname("definitions"), {
+            "id": f"definitions_{process.id}",
+            "targetNamespace": "http://bpmn.io/schema/bpmn",
+            "exporter": "BPM DSL",
+            "exporterVersion": "1.0",
+        }, nsmap=_NSMAP)
         
         # Add deduplicated bpmn:message definitions for all message events
         for msg_name in self._collect_message_names(process):
-            msg_def = SubElement(definitions, "message")
-            msg_def.set("id", f"message-{msg_name}")
-            msg_def.set("name", msg_name)
+            _sub(definitions, "message", id=f"message-{msg_name}", name=msg_name)
 
         # Add error definitions if processEntity elements exist
-        has_process_entity = any(isinstance(elem, ProcessEntity) for elem in process.elements)
+        has_process_entity = process.process_entity is not None
         if has_process_entity:
-            error_def = SubElement(definitions, "error")
-            error_def.set("id", "process-entity-validation-error")
-            error_def.set("name", "Process Entity Validation Error")
-            error_def.set("errorCode", "PROCESS_ENTITY_VALIDATION_ERROR")
+            _sub(definitions, "error", id="process-entity-validation-error",
+                 name="Process Entity Validation Error", errorCode="PROCESS_ENTITY_VALIDATION_ERROR")
 
         # Add error definitions for boundary error events (deduplicated by error code)
         seen_error_codes = set()
         self._collect_error_definitions(definitions, process.elements, seen_error_codes)
         
         # Create process element
-        bpmn_process = SubElement(definitions, "process")
-        bpmn_process.set("id", process.id)
-        bpmn_process.set("name", process.name)
-        bpmn_process.set("isExecutable", "true")
+        bpmn_process = _sub(definitions, "process", id=process.id, name=process.name,
+                            isExecutable="true")
         
         # Version is handled via Zeebe deployment, not as BPMN attribute
         # if process.version:
@@ -161,6 +285,13 @@ class BPMNGenerator:
         # Add process elements
         self._add_elements(bpmn_process, process.elements)
         
+        # Index the processEntity validation elements once for flows and diagram
+        self._process_entities = {
+            element.id: element._generated_elements
+            for element in process.elements
+            if element._kind == 'process_entity'
+        }
+        
         # Add sequence flows
         self._add_flows(bpmn_process, process.flows)
         
@@ -171,146 +302,122 @@ class BPMNGenerator:
     
     def _add_elements(self, parent: Element, elements: List[BPMElement]) -> None:
         """Add process elements to the BPMN process."""
+        dispatch = self._element_dispatch
         for element in elements:
-            if isinstance(element, StartEvent):
-                self._add_start_event(parent, element)
-            elif isinstance(element, EndEvent):
-                self._add_end_event(parent, element)
-            elif isinstance(element, ScriptCall):
-                self._add_script_task(parent, element)
-            elif isinstance(element, ServiceTask):
-                self._add_service_task(parent, element)
-            elif isinstance(element, ProcessEntity):
-                self._add_process_entity(parent, element)
-            elif isinstance(element, ReceiveMessageEvent):
-                self._add_receive_message_event(parent, element)
-            elif isinstance(element, TimerEvent):
-                self._add_timer_event(parent, element)
-            elif isinstance(element, Subprocess):
-                self._add_subprocess(parent, element)
-            elif isinstance(element, CallActivity):
-                self._add_call_activity(parent, element)
-            elif isinstance(element, Gateway):
-                self._add_gateway(parent, element)
+            handler = dispatch.get(type(element))
+            if handler is None:
+                handler = self._resolve_element_handler(type(element))
+            if handler is not None:
+                handler(parent, element)
+
+    def _resolve_element_handler(self, element_type: type):
+        """Find the handler for a subclass of a known element type via its MRO.
+
+        A hit is cached in the dispatch table so each subclass is resolved once.
+        """
+        dispatch = self._element_dispatch
+        handler = next((dispatch[base] for base in element_type.__mro__[1:] if base in dispatch), None)
+        if handler is not None:
+            dispatch[element_type] = handler
+        return handler
     
     def _add_timer_event_definition(self, parent: Element, timer: TimerDefinition) -> None:
         """Add a timerEventDefinition child element with duration/date/cycle."""
-        timer_def = SubElement(parent, "timerEventDefinition")
+        timer_def = _sub(parent, "timerEventDefinition")
         if timer.duration:
-            td_elem = SubElement(timer_def, "timeDuration")
+            td_elem = _sub(timer_def, "timeDuration")
             td_elem.text = timer.duration
         elif timer.date:
-            td_elem = SubElement(timer_def, "timeDate")
+            td_elem = _sub(timer_def, "timeDate")
             td_elem.text = timer.date
         elif timer.cycle:
-            td_elem = SubElement(timer_def, "timeCycle")
+            td_elem = _sub(timer_def, "timeCycle")
             td_elem.text = timer.cycle
 
     def _add_start_event(self, parent: Element, start: StartEvent) -> None:
         """Add a start event to the process. Includes timerEventDefinition if timer is set."""
-        start_event = SubElement(parent, "startEvent")
-        start_event.set("id", start.id)
-        start_event.set("name", start.name)
+        start_event = _sub(parent, "startEvent", id=start.id, name=start.name)
         if start.timer:
             self._add_timer_event_definition(start_event, start.timer)
         if start.message:
-            msg_event_def = SubElement(start_event, "messageEventDefinition")
-            msg_event_def.set("messageRef", f"message-{start.message}")
+            _sub(start_event, "messageEventDefinition", messageRef=f"message-{start.message}")
     
     def _add_timer_event(self, parent: Element, timer_event: TimerEvent) -> None:
         """Add a timer intermediate catch event to the process."""
-        ice = SubElement(parent, "intermediateCatchEvent")
-        ice.set("id", timer_event.id)
-        ice.set("name", timer_event.name)
+        ice = _sub(parent, "intermediateCatchEvent", id=timer_event.id, name=timer_event.name)
         if timer_event.timer:
             self._add_timer_event_definition(ice, timer_event.timer)
 
     def _add_receive_message_event(self, parent: Element, event: ReceiveMessageEvent) -> None:
         """Add a receive message intermediate catch event to the process."""
-        ice = SubElement(parent, "intermediateCatchEvent")
-        ice.set("id", event.id)
-        ice.set("name", event.name)
-        msg_event_def = SubElement(ice, "messageEventDefinition")
-        msg_event_def.set("messageRef", f"message-{event.message}")
-        ext = SubElement(ice, "extensionElements")
-        subscription = SubElement(ext, "zeebe:subscription")
-        subscription.set("correlationKey", self._ensure_feel_expression(event.correlation_key))
+        ice = _sub(parent, "intermediateCatchEvent", id=event.id, name=event.name)
+        _sub(ice, "messageEventDefinition", messageRef=f"message-{event.message}")
+        ext = _sub(ice, "extensionElements")
+        _sub(ext, "zeebe:subscription",
+             correlationKey=self._ensure_feel_expression(event.correlation_key))
 
     def _add_end_event(self, parent: Element, end: EndEvent) -> None:
         """Add an end event to the process."""
-        end_event = SubElement(parent, "endEvent")
-        end_event.set("id", end.id)
-        end_event.set("name", end.name)
+        _sub(parent, "endEvent", id=end.id, name=end.name)
     
     def _add_script_task(self, parent: Element, script: ScriptCall) -> None:
         """Add a script task to the process."""
-        script_task = SubElement(parent, "scriptTask")
-        script_task.set("id", script.id)
-        script_task.set("name", script.name)
+        script_task = _sub(parent, "scriptTask", id=script.id, name=script.name)
         
         # Add Zeebe extension elements
-        extension_elements = SubElement(script_task, "extensionElements")
+        extension_elements = _sub(script_task, "extensionElements")
         
         # Add Zeebe script definition
-        zeebe_script = SubElement(extension_elements, "zeebe:script")
         # The XML library will automatically escape quotes in attributes
-        zeebe_script.set("expression", self._ensure_feel_expression(script.script))
-        zeebe_script.set("resultVariable", script.result_variable)
+        _sub(extension_elements, "zeebe:script",
+             expression=self._ensure_feel_expression(script.script),
+             resultVariable=script.result_variable)
         
         # Add input/output variable mappings if specified
         if script.input_mappings or script.output_mappings:
-            io_mapping = SubElement(extension_elements, "zeebe:ioMapping")
+            io_mapping = _sub(extension_elements, "zeebe:ioMapping")
             
-            # Input mappings: map process variables to local script variables
+            # Input mappings: map process variables (FEEL source) to local script variables
             for mapping in script.input_mappings:
-                input_param = SubElement(io_mapping, "zeebe:input")
-                input_param.set("source", self._ensure_feel_expression(mapping.source))  # Process variable (needs FEEL expression)
-                input_param.set("target", mapping.target)  # Local variable
+                _sub(io_mapping, "zeebe:input",
+                     source=self._ensure_feel_expression(mapping.source), target=mapping.target)
             
-            # Output mappings: map local script variables back to process variables
+            # Output mappings: map local script variables (FEEL source) back to process variables
             for mapping in script.output_mappings:
-                output_param = SubElement(io_mapping, "zeebe:output")
-                output_param.set("source", self._ensure_feel_expression(mapping.source))  # Local variable (needs FEEL expression)
-                output_param.set("target", mapping.target)  # Process variable
+                _sub(io_mapping, "zeebe:output",
+                     source=self._ensure_feel_expression(mapping.source), target=mapping.target)
     
     def _add_service_task(self, parent: Element, service: ServiceTask) -> None:
         """Add a service task to the process."""
-        service_task = SubElement(parent, "serviceTask")
-        service_task.set("id", service.id)
-        service_task.set("name", service.name)
+        service_task = _sub(parent, "serviceTask", id=service.id, name=service.name)
         
         # Add Zeebe extension elements
-        extension_elements = SubElement(service_task, "extensionElements")
+        extension_elements = _sub(service_task, "extensionElements")
         
         # Add Zeebe task definition
-        zeebe_task_def = SubElement(extension_elements, "zeebe:taskDefinition")
-        zeebe_task_def.set("type", service.task_type)
+        zeebe_task_def = _sub(extension_elements, "zeebe:taskDefinition", type=service.task_type)
         if service.retries is not None:
             zeebe_task_def.set("retries", str(service.retries))
         
         # Add task headers if specified
         if service.headers:
-            zeebe_headers = SubElement(extension_elements, "zeebe:taskHeaders")
+            zeebe_headers = _sub(extension_elements, "zeebe:taskHeaders")
             for header in service.headers:
-                zeebe_header = SubElement(zeebe_headers, "zeebe:header")
-                zeebe_header.set("key", header.key)
-                zeebe_header.set("value", header.value)
+                _sub(zeebe_headers, "zeebe:header", key=header.key, value=header.value)
         
         # Add input/output variable mappings if specified
         if service.input_mappings or service.output_mappings:
-            io_mapping = SubElement(extension_elements, "zeebe:ioMapping")
+            io_mapping = _sub(extension_elements, "zeebe:ioMapping")
             
-            # Input mappings: map process variables to local task variables
+            # Input mappings: map process variables (FEEL source) to local task variables
             for mapping in service.input_mappings:
-                input_param = SubElement(io_mapping, "zeebe:input")
-                input_param.set("source", self._ensure_feel_expression(mapping.source))  # Process variable (needs FEEL expression)
-                input_param.set("target", mapping.target)  # Local variable
+                _sub(io_mapping, "zeebe:input",
+                     source=self._ensure_feel_expression(mapping.source), target=mapping.target)
             
-            # Output mappings: map local task variables back to process variables
+            # Output mappings: map local task variables (FEEL source) back to process variables
             for mapping in service.output_mappings:
-                output_param = SubElement(io_mapping, "zeebe:output")
-                output_param.set("source", self._ensure_feel_expression(mapping.source))  # Local variable (needs FEEL expression)
-                output_param.set("target", mapping.target)  # Process variable
+                _sub(io_mapping, "zeebe:output",
+                     source=self._ensure_feel_expression(mapping.source), target=mapping.target)
 
         # Add multi-instance loop characteristics
         if service.for_each:
@@ -327,38 +434,27 @@ class BPMNGenerator:
 
     def _add_boundary_timer_event(self, parent: Element, be: BoundaryTimerEvent, attached_to: str) -> None:
         """Add a boundary timer event element."""
-        boundary = SubElement(parent, "boundaryEvent")
-        boundary.set("id", be.id)
-        boundary.set("name", be.name)
-        boundary.set("attachedToRef", attached_to)
-        boundary.set("cancelActivity", "true" if be.interrupting else "false")
+        boundary = _sub(parent, "boundaryEvent", id=be.id, name=be.name, attachedToRef=attached_to,
+                        cancelActivity="true" if be.interrupting else "false")
         if be.duration:
             timer_def = TimerDefinition(duration=be.duration)
             self._add_timer_event_definition(boundary, timer_def)
 
     def _add_boundary_error_event(self, parent: Element, be: BoundaryErrorEvent, attached_to: str) -> None:
         """Add a boundary error event element."""
-        boundary = SubElement(parent, "boundaryEvent")
-        boundary.set("id", be.id)
-        boundary.set("name", be.name)
-        boundary.set("attachedToRef", attached_to)
-        boundary.set("cancelActivity", "true" if be.interrupting else "false")
+        boundary = _sub(parent, "boundaryEvent", id=be.id, name=be.name, attachedToRef=attached_to,
+                        cancelActivity="true" if be.interrupting else "false")
         if be.error_code:
-            error_event_def = SubElement(boundary, "errorEventDefinition")
-            error_event_def.set("errorRef", f"error-{be.error_code}")
+            _sub(boundary, "errorEventDefinition", errorRef=f"error-{be.error_code}")
 
     def _add_boundary_message_event(self, parent: Element, be: BoundaryMessageEvent, attached_to: str) -> None:
         """Add a boundary message event element."""
-        boundary = SubElement(parent, "boundaryEvent")
-        boundary.set("id", be.id)
-        boundary.set("name", be.name)
-        boundary.set("attachedToRef", attached_to)
-        boundary.set("cancelActivity", "true" if be.interrupting else "false")
-        msg_event_def = SubElement(boundary, "messageEventDefinition")
-        msg_event_def.set("messageRef", f"message-{be.message}")
-        ext = SubElement(boundary, "extensionElements")
-        subscription = SubElement(ext, "zeebe:subscription")
-        subscription.set("correlationKey", self._ensure_feel_expression(be.correlation_key))
+        boundary = _sub(parent, "boundaryEvent", id=be.id, name=be.name, attachedToRef=attached_to,
+                        cancelActivity="true" if be.interrupting else "false")
+        _sub(boundary, "messageEventDefinition", messageRef=f"message-{be.message}")
+        ext = _sub(boundary, "extensionElements")
+        _sub(ext, "zeebe:subscription",
+             correlationKey=self._ensure_feel_expression(be.correlation_key))
 
     def _add_multi_instance(self, parent_element: Element, for_each: str, as_var: Optional[str], parallel: bool) -> None:
         """Add multiInstanceLoopCharacteristics to a task or subprocess element.
@@ -366,20 +462,18 @@ class BPMNGenerator:
         Generates the BPMN standard element with Zeebe-specific extensions for
         the collection (input) and element variable (output).
         """
-        mi = SubElement(parent_element, "multiInstanceLoopCharacteristics")
+        mi = _sub(parent_element, "multiInstanceLoopCharacteristics")
         if not parallel:
             mi.set("isSequential", "true")
-        ext = SubElement(mi, "extensionElements")
-        loop_char = SubElement(ext, "zeebe:loopCharacteristics")
-        loop_char.set("inputCollection", self._ensure_feel_expression(for_each))
+        ext = _sub(mi, "extensionElements")
+        loop_char = _sub(ext, "zeebe:loopCharacteristics",
+                         inputCollection=self._ensure_feel_expression(for_each))
         if as_var:
             loop_char.set("inputElement", as_var)
 
     def _add_subprocess(self, parent: Element, sub: 'Subprocess') -> None:
         """Add an embedded subprocess with nested elements, flows, and optional multi-instance."""
-        sub_element = SubElement(parent, "subProcess")
-        sub_element.set("id", sub.id)
-        sub_element.set("name", sub.name)
+        sub_element = _sub(parent, "subProcess", id=sub.id, name=sub.name)
 
         # Add multi-instance if configured
         if sub.for_each:
@@ -404,28 +498,23 @@ class BPMNGenerator:
         Generates bpmn:callActivity with zeebe:calledElement for the target
         process ID and optional zeebe:ioMapping for variable propagation.
         """
-        call_element = SubElement(parent, "callActivity")
-        call_element.set("id", call.id)
-        call_element.set("name", call.name)
+        call_element = _sub(parent, "callActivity", id=call.id, name=call.name)
 
-        extension_elements = SubElement(call_element, "extensionElements")
+        extension_elements = _sub(call_element, "extensionElements")
 
         # Zeebe called element reference
-        called_element = SubElement(extension_elements, "zeebe:calledElement")
-        called_element.set("processId", call.process_id)
-        called_element.set("propagateAllChildVariables", "false")
+        _sub(extension_elements, "zeebe:calledElement", processId=call.process_id,
+             propagateAllChildVariables="false")
 
         # Add IO mappings if specified
         if call.input_mappings or call.output_mappings:
-            io_mapping = SubElement(extension_elements, "zeebe:ioMapping")
+            io_mapping = _sub(extension_elements, "zeebe:ioMapping")
             for mapping in call.input_mappings:
-                inp = SubElement(io_mapping, "zeebe:input")
-                inp.set("source", self._ensure_feel_expression(mapping.source))
-                inp.set("target", mapping.target)
+                _sub(io_mapping, "zeebe:input",
+                     source=self._ensure_feel_expression(mapping.source), target=mapping.target)
             for mapping in call.output_mappings:
-                out = SubElement(io_mapping, "zeebe:output")
-                out.set("source", self._ensure_feel_expression(mapping.source))
-                out.set("target", mapping.target)
+                _sub(io_mapping, "zeebe:output",
+                     source=self._ensure_feel_expression(mapping.source), target=mapping.target)
 
     def _add_process_entity(self, parent: Element, process_entity: ProcessEntity) -> None:
         """Add a process entity as a service task to the process.
@@ -437,73 +526,58 @@ class BPMNGenerator:
         - An error end event for validation failures
         """
         # 1. Add the main service task for process entity validation
-        service_task = SubElement(parent, "serviceTask")
-        service_task.set("id", process_entity.id)
-        service_task.set("name", process_entity.name)
+        service_task = _sub(parent, "serviceTask", id=process_entity.id, name=process_entity.name)
         
         # Add Zeebe extension elements
-        extension_elements = SubElement(service_task, "extensionElements")
+        extension_elements = _sub(service_task, "extensionElements")
         
         # Add Zeebe task definition with default task type
-        zeebe_task_def = SubElement(extension_elements, "zeebe:taskDefinition")
-        zeebe_task_def.set("type", "process-entity-validator")
         # ProcessEntity uses default retries (3)
-        zeebe_task_def.set("retries", "3")
+        _sub(extension_elements, "zeebe:taskDefinition", type="process-entity-validator", retries="3")
         
         # Add task headers with the entity model path
-        zeebe_headers = SubElement(extension_elements, "zeebe:taskHeaders")
+        zeebe_headers = _sub(extension_elements, "zeebe:taskHeaders")
         
         # Add the entityModel header (using the openapi_file_path from the process)
-        entity_model_header = SubElement(zeebe_headers, "zeebe:header")
-        entity_model_header.set("key", "entityModel")
         # Use the openapi_file_path from the process, or empty string if not set
         openapi_path = self.layout_engine.process.openapi_file_path if hasattr(self.layout_engine, 'process') and self.layout_engine.process else ""
-        entity_model_header.set("value", openapi_path or "")
+        _sub(zeebe_headers, "zeebe:header", key="entityModel", value=openapi_path or "")
         
         # Add the entityName header
-        entity_name_header = SubElement(zeebe_headers, "zeebe:header")
-        entity_name_header.set("key", "entityName")
-        entity_name_header.set("value", process_entity.entity_name)
+        _sub(zeebe_headers, "zeebe:header", key="entityName", value=process_entity.entity_name)
         
         # Add I/O mapping for automatic input/output variables
-        io_mapping = SubElement(extension_elements, "zeebe:ioMapping")
+        io_mapping = _sub(extension_elements, "zeebe:ioMapping")
         
         # Input: processEntity variable (data to validate)
-        input_process_entity = SubElement(io_mapping, "zeebe:input")
-        input_process_entity.set("source", "=processEntity")
-        input_process_entity.set("target", "processEntity")
+        _sub(io_mapping, "zeebe:input", source="=processEntity", target="processEntity")
         
         # Output: entityValidationResult (validation results)
-        output_result = SubElement(io_mapping, "zeebe:output")
-        output_result.set("source", "=validationResult")
-        output_result.set("target", "entityValidationResult")
+        _sub(io_mapping, "zeebe:output", source="=validationResult", target="entityValidationResult")
         
         # 2. Add XOR gateway for validation error checking
         validation_gateway_id = f"{process_entity.id}-validation-gateway"
-        xor_gateway = SubElement(parent, "exclusiveGateway")
-        xor_gateway.set("id", validation_gateway_id)
-        xor_gateway.set("name", "Validation Check")
+        xor_gateway = _sub(parent, "exclusiveGateway", id=validation_gateway_id, name="Validation Check")
         
-        # Store reference for setting default flow later
-        self._gateway_elements[validation_gateway_id] = xor_gateway
+        # The success flow out of the gateway is its default (validation passed)
+        default_flow_id = self._default_flows.get(validation_gateway_id)
+        if default_flow_id:
+            xor_gateway.set("default", default_flow_id)
         
         # 3. Add error end event for validation failures
         error_end_id = f"{process_entity.id}-validation-error"
-        error_end_event = SubElement(parent, "endEvent")
-        error_end_event.set("id", error_end_id)
-        error_end_event.set("name", "Validation Error")
+        error_end_event = _sub(parent, "endEvent", id=error_end_id, name="Validation Error")
         
         # Add error event definition
-        error_event_def = SubElement(error_end_event, "errorEventDefinition")
-        error_event_def.set("id", f"{error_end_id}-def")
-        error_event_def.set("errorRef", "process-entity-validation-error")
+        _sub(error_end_event, "errorEventDefinition", id=f"{error_end_id}-def",
+             errorRef="process-entity-validation-error")
         
         # Store the generated element IDs for flow generation
-        if not hasattr(process_entity, '_generated_elements'):
-            process_entity._generated_elements = {}
         process_entity._generated_elements.update({
             'validation_gateway_id': validation_gateway_id,
-            'error_end_id': error_end_id
+            'error_end_id': error_end_id,
+            'validation_flow_id': f"flow_{process_entity.id}_to_{validation_gateway_id}",
+            'error_flow_id': f"flow_{validation_gateway_id}_to_{error_end_id}",
         })
     
     def _add_gateway(self, parent: Element, gateway: Gateway) -> None:
@@ -512,24 +586,18 @@ class BPMNGenerator:
         Emits exclusiveGateway for xor type and parallelGateway for parallel type.
         Only exclusive gateways support the default-flow attribute (otherwise semantics).
         """
-        if gateway.gateway_type == "parallel":
-            gw_element = SubElement(parent, "parallelGateway")
-        else:
-            gw_element = SubElement(parent, "exclusiveGateway")
-        gw_element.set("id", gateway.id)
-        gw_element.set("name", gateway.name)
+        tag = "parallelGateway" if gateway.gateway_type == "parallel" else "exclusiveGateway"
+        gw_element = _sub(parent, tag, id=gateway.id, name=gateway.name)
 
         # Only exclusive gateways support the default flow attribute
         if gateway.gateway_type != "parallel":
-            self._gateway_elements[gateway.id] = gw_element
+            default_flow_id = self._default_flows.get(gateway.id)
+            if default_flow_id:
+                gw_element.set("default", default_flow_id)
     
     def _add_flows(self, parent: Element, flows: List[Flow]) -> None:
         """Add sequence flows to the process, handling processEntity validation flows automatically."""
-        # First, collect all processEntity elements and their generated elements
-        process_entities = {}
-        for element in self.layout_engine.process.elements if hasattr(self.layout_engine, 'process') else []:
-            if isinstance(element, ProcessEntity) and hasattr(element, '_generated_elements'):
-                process_entities[element.id] = element._generated_elements
+        process_entities = self._process_entities
         
         for flow in flows:
             # Check if this flow targets a processEntity - if so, we need to handle validation flows
@@ -546,22 +614,16 @@ class BPMNGenerator:
                 error_end_id = generated['error_end_id']
                 
                 # Flow from processEntity to validation gateway
-                validation_flow_id = f"flow_{flow.target_id}_to_{validation_gateway_id}"
-                validation_flow = SubElement(parent, "sequenceFlow")
-                validation_flow.set("id", validation_flow_id)
-                validation_flow.set("sourceRef", flow.target_id)
-                validation_flow.set("targetRef", validation_gateway_id)
+                _sub(parent, "sequenceFlow", id=generated['validation_flow_id'],
+                     sourceRef=flow.target_id, targetRef=validation_gateway_id)
                 
                 # Flow from validation gateway to error end (validation failed)
-                error_flow_id = f"flow_{validation_gateway_id}_to_{error_end_id}"
-                error_flow = SubElement(parent, "sequenceFlow")
-                error_flow.set("id", error_flow_id)
-                error_flow.set("sourceRef", validation_gateway_id)
-                error_flow.set("targetRef", error_end_id)
+                error_flow = _sub(parent, "sequenceFlow", id=generated['error_flow_id'],
+                                  sourceRef=validation_gateway_id, targetRef=error_end_id)
                 
                 # Add condition for validation failure
-                error_condition_expr = SubElement(error_flow, "conditionExpression")
-                error_condition_expr.set("xsi:type", "tFormalExpression")
+                error_condition_expr = _sub(error_flow, "conditionExpression")
+                error_condition_expr.set(_XSI_TYPE, "tFormalExpression")
                 error_condition_expr.text = "=entityValidationResult.isValid = false"
                 
             elif source_is_process_entity:
@@ -570,21 +632,14 @@ class BPMNGenerator:
                 validation_gateway_id = generated['validation_gateway_id']
                 
                 # Create flow from validation gateway to the original target (validation passed)
-                success_flow_id = f"flow_{validation_gateway_id}_to_{flow.target_id}"
-                success_flow = SubElement(parent, "sequenceFlow")
-                success_flow.set("id", success_flow_id)
-                success_flow.set("sourceRef", validation_gateway_id)
-                success_flow.set("targetRef", flow.target_id)
-                
-                # This is the default flow (validation passed)
-                if validation_gateway_id in self._gateway_elements:
-                    gateway_element = self._gateway_elements[validation_gateway_id]
-                    gateway_element.set("default", success_flow_id)
+                success_flow = _sub(parent, "sequenceFlow",
+                                    id=f"flow_{validation_gateway_id}_to_{flow.target_id}",
+                                    sourceRef=validation_gateway_id, targetRef=flow.target_id)
                 
                 # Handle original flow conditions if any
                 if flow.condition:
-                    condition_expr = SubElement(success_flow, "conditionExpression")
-                    condition_expr.set("xsi:type", "tFormalExpression")
+                    condition_expr = _sub(success_flow, "conditionExpression")
+                    condition_expr.set(_XSI_TYPE, "tFormalExpression")
                     condition_expr.text = f"=entityValidationResult.isValid = true and ({self._ensure_feel_expression(flow.condition)[1:]})"
                 
             else:
@@ -593,109 +648,80 @@ class BPMNGenerator:
     
     def _add_single_flow(self, parent: Element, flow: Flow) -> None:
         """Add a single sequence flow to the process."""
-        sequence_flow = SubElement(parent, "sequenceFlow")
-        flow_id = f"flow_{flow.source_id}_to_{flow.target_id}"
-        sequence_flow.set("id", flow_id)
-        sequence_flow.set("sourceRef", flow.source_id)
-        sequence_flow.set("targetRef", flow.target_id)
-        
-        # Handle default flows
-        if flow.is_default:
-            # Set the default attribute on the source gateway
-            if flow.source_id in self._gateway_elements:
-                gateway_element = self._gateway_elements[flow.source_id]
-                gateway_element.set("default", flow_id)
-            # Default flows should not have conditions
-        elif flow.condition:
+        flow_id = self._flow_ids[id(flow)]
+        sequence_flow = _sub(parent, "sequenceFlow", id=flow_id, sourceRef=flow.source_id,
+                             targetRef=flow.target_id)
+        
+        # Default flows are marked on their source gateway and carry no condition
+        if not flow.is_default and flow.condition:
             # Add condition expression for non-default flows
-            condition_expr = SubElement(sequence_flow, "conditionExpression")
-            condition_expr.set("xsi:type", "tFormalExpression")
+            condition_expr = _sub(sequence_flow, "conditionExpression")
+            condition_expr.set(_XSI_TYPE, "tFormalExpression")
             condition_expr.text = self._ensure_feel_expression(flow.condition)
     
     def _add_diagram(self, definitions: Element, process: Process) -> None:
         """Add advanced BPMN diagram information with professional layout."""
-        diagram = SubElement(definitions, "bpmndi:BPMNDiagram")
-        diagram.set("id", f"diagram_{process.id}")
-        
-        plane = SubElement(diagram, "bpmndi:BPMNPlane")
-        plane.set("id", f"plane_{process.id}")
-        plane.set("bpmnElement", process.id)
+        diagram = _sub(definitions, "bpmndi:BPMNDiagram", id=f"diagram_{process.id}")
+        plane = _sub(diagram, "bpmndi:BPMNPlane", id=f"plane_{process.id}", bpmnElement=process.id)
         
         # Calculate advanced layout using the layout engine
         element_positions, edge_routes = self.layout_engine.calculate_layout(process)
         
+        # The loops below emit most of the document; bind the hot lookups locally
+        sub = _sub
+        add_bounds = _add_bounds
+        add_waypoint = _add_waypoint
+        get_position = element_positions.get
+        
         # Add shapes for original elements with calculated positions
         for element in process.elements:
-            if element.id not in element_positions:
+            pos = get_position(element.id)
+            if pos is None:
                 continue
                 
-            shape = SubElement(plane, "bpmndi:BPMNShape")
-            shape.set("id", f"shape_{element.id}")
-            shape.set("bpmnElement", element.id)
-            
-            pos = element_positions[element.id]
-            bounds = SubElement(shape, "dc:Bounds")
-            bounds.set("x", str(int(pos.x)))
-            bounds.set("y", str(int(pos.y)))
-            bounds.set("width", str(int(pos.width)))
-            bounds.set("height", str(int(pos.height)))
+            shape = sub(plane, "bpmndi:BPMNShape", id=f"shape_{element.id}", bpmnElement=element.id)
+            add_bounds(shape, pos.x, pos.y, pos.width, pos.height)
         
         # Add shapes for boundary events (nested inside service tasks and subprocesses)
         for element in process.elements:
-            if isinstance(element, (ServiceTask, Subprocess)):
-                for be in getattr(element, 'boundary_events', None) or []:
-                    if be.id not in element_positions:
+            if element._kind == 'service_task' or element._kind == 'subprocess':
+                for be in element.boundary_events or []:
+                    pos = get_position(be.id)
+                    if pos is None:
                         continue
-                    shape = SubElement(plane, "bpmndi:BPMNShape")
-                    shape.set("id", f"shape_{be.id}")
-                    shape.set("bpmnElement", be.id)
-                    pos = element_positions[be.id]
-                    bounds = SubElement(shape, "dc:Bounds")
-                    bounds.set("x", str(int(pos.x)))
-                    bounds.set("y", str(int(pos.y)))
-                    bounds.set("width", str(int(pos.width)))
-                    bounds.set("height", str(int(pos.height)))
-
-        # Add shapes for generated processEntity validation elements
-        for element in process.elements:
-            if isinstance(element, ProcessEntity) and hasattr(element, '_generated_elements'):
-                generated = element._generated_elements
-                original_pos = element_positions.get(element.id)
+                    shape = sub(plane, "bpmndi:BPMNShape", id=f"shape_{be.id}", bpmnElement=be.id)
+                    add_bounds(shape, pos.x, pos.y, pos.width, pos.height)
+
+        # Add shapes for generated processEntity validation elements, keeping
+        # their geometry for the generated flow edges
+        validation_geometry = {}
+        for entity_id, generated in self._process_entities.items():
+            original_pos = get_position(entity_id)
+            
+            if original_pos:
+                # Position validation gateway to the right of the processEntity
+                gateway_x = original_pos.x + original_pos.width + 80
+                gateway_y = original_pos.y + (original_pos.height - 50) / 2  # Center vertically
                 
-                if original_pos:
-                    # Position validation gateway to the right of the processEntity
-                    gateway_x = original_pos.x + original_pos.width + 80
-                    gateway_y = original_pos.y + (original_pos.height - 50) / 2  # Center vertically
-                    
-                    gateway_shape = SubElement(plane, "bpmndi:BPMNShape")
-                    gateway_shape.set("id", f"shape_{generated['validation_gateway_id']}")
-                    gateway_shape.set("bpmnElement", generated['validation_gateway_id'])
-                    
-                    gateway_bounds = SubElement(gateway_shape, "dc:Bounds")
-                    gateway_bounds.set("x", str(int(gateway_x)))
-                    gateway_bounds.set("y", str(int(gateway_y)))
-                    gateway_bounds.set("width", "50")
-                    gateway_bounds.set("height", "50")
-                    
-                    # Position error end event below the gateway
-                    error_x = gateway_x + (50 - 36) / 2  # Center horizontally with gateway
-                    error_y = gateway_y + 50 + 60  # Below gateway with spacing
-                    
-                    error_shape = SubElement(plane, "bpmndi:BPMNShape")
-                    error_shape.set("id", f"shape_{generated['error_end_id']}")
-                    error_shape.set("bpmnElement", generated['error_end_id'])
-                    
-                    error_bounds = SubElement(error_shape, "dc:Bounds")
-                    error_bounds.set("x", str(int(error_x)))
-                    error_bounds.set("y", str(int(error_y)))
-                    error_bounds.set("width", "36")
-                    error_bounds.set("height", "36")
-        
-        # Collect processEntity IDs to skip their outgoing flow diagrams
-        process_entity_ids = set()
-        for element in process.elements:
-            if isinstance(element, ProcessEntity):
-                process_entity_ids.add(element.id)
+                gateway_shape = sub(plane, "bpmndi:BPMNShape",
+                                    id=f"shape_{generated['validation_gateway_id']}",
+                                    bpmnElement=generated['validation_gateway_id'])
+                add_bounds(gateway_shape, gateway_x, gateway_y, 50, 50)
+                
+                # Position error end event below the gateway
+                error_x = gateway_x + (50 - 36) / 2  # Center horizontally with gateway
+                error_y = gateway_y + 50 + 60  # Below gateway with spacing
+                
+                error_shape = sub(plane, "bpmndi:BPMNShape",
+                                  id=f"shape_{generated['error_end_id']}",
+                                  bpmnElement=generated['error_end_id'])
+                add_bounds(error_shape, error_x, error_y, 36, 36)
+                
+                validation_geometry[entity_id] = (original_pos, gateway_x, gateway_y, error_x, error_y)
+        
+        # processEntity outgoing flows are drawn by _add_generated_flow_diagrams
+        process_entity_ids = self._process_entities
+        flow_ids = self._flow_ids
         
         # Add edges with calculated routes for original flows
         for flow in process.flows:
@@ -704,110 +730,100 @@ class BPMNGenerator:
             if flow.source_id in process_entity_ids:
                 continue
             
-            flow_id = f"flow_{flow.source_id}_to_{flow.target_id}"
+            route = edge_routes.get((flow.source_id, flow.target_id))
             
-            if flow_id not in edge_routes:
+            if route is None:
                 continue
-                
-            edge = SubElement(plane, "bpmndi:BPMNEdge")
-            edge.set("id", f"edge_{flow_id}")
-            edge.set("bpmnElement", flow_id)
+            
+            flow_id = flow_ids[id(flow)]
+            edge = sub(plane, "bpmndi:BPMNEdge", id=f"edge_{flow_id}", bpmnElement=flow_id)
             
             # Add waypoints from calculated route
-            route = edge_routes[flow_id]
             for waypoint in route.waypoints:
-                wp = SubElement(edge, "di:waypoint")
-                wp.set("x", str(int(waypoint.x)))
-                wp.set("y", str(int(waypoint.y)))
+                add_waypoint(edge, waypoint.x, waypoint.y)
         
         # Add edges for generated processEntity validation flows
-        self._add_generated_flow_diagrams(plane, process, element_positions)
+        self._add_generated_flow_diagrams(plane, process, element_positions, validation_geometry)
     
-    def _add_generated_flow_diagrams(self, plane: Element, process: Process, element_positions: Dict[str, Bounds]) -> None:
-        """Add diagram information for generated processEntity validation flows."""
-        for element in process.elements:
-            if isinstance(element, ProcessEntity) and hasattr(element, '_generated_elements'):
-                generated = element._generated_elements
-                original_pos = element_positions.get(element.id)
-                
-                if not original_pos:
-                    continue
-                
-                # Calculate positions
-                gateway_x = original_pos.x + original_pos.width + 80
-                gateway_y = original_pos.y + (original_pos.height - 50) / 2
-                error_x = gateway_x + (50 - 36) / 2
-                error_y = gateway_y + 50 + 60
-                
-                # Flow from processEntity to validation gateway
-                validation_flow_id = f"flow_{element.id}_to_{generated['validation_gateway_id']}"
-                validation_edge = SubElement(plane, "bpmndi:BPMNEdge")
-                validation_edge.set("id", f"edge_{validation_flow_id}")
-                validation_edge.set("bpmnElement", validation_flow_id)
-                
-                # Waypoints for processEntity to gateway
-                wp1 = SubElement(validation_edge, "di:waypoint")
-                wp1.set("x", str(int(original_pos.x + original_pos.width)))
-                wp1.set("y", str(int(original_pos.y + original_pos.height / 2)))
-                
-                wp2 = SubElement(validation_edge, "di:waypoint")
-                wp2.set("x", str(int(gateway_x)))
-                wp2.set("y", str(int(gateway_y + 25)))
-                
-                # Flow from validation gateway to error end
-                error_flow_id = f"flow_{generated['validation_gateway_id']}_to_{generated['error_end_id']}"
-                error_edge = SubElement(plane, "bpmndi:BPMNEdge")
-                error_edge.set("id", f"edge_{error_flow_id}")
-                error_edge.set("bpmnElement", error_flow_id)
-                
-                # Waypoints for gateway to error end
-                wp3 = SubElement(error_edge, "di:waypoint")
-                wp3.set("x", str(int(gateway_x + 25)))
-                wp3.set("y", str(int(gateway_y + 50)))
-                
-                wp4 = SubElement(error_edge, "di:waypoint")
-                wp4.set("x", str(int(error_x + 18)))
-                wp4.set("y", str(int(error_y)))
+    def _add_generated_flow_diagrams(self, plane: Element, process: Process, element_positions: Dict[str, Bounds],
+                                     validation_geometry: Dict[str, tuple]) -> None:
+        """Add diagram information for generated processEntity validation flows.
+
+        ``validation_geometry`` maps each positioned processEntity ID to its
+        bounds and the gateway/error-end coordinates computed by ``_add_diagram``.
+        """
+        sub = _sub
+        add_waypoint = _add_waypoint
+        
+        # Index the flows leaving each processEntity instead of rescanning all flows per entity
+        flows_by_source = defaultdict(list)
+        for flow in process.flows:
+            if flow.source_id in validation_geometry:
+                flows_by_source[flow.source_id].append(flow)
+        
+        for entity_id, geometry in validation_geometry.items():
+            original_pos, gateway_x, gateway_y, error_x, error_y = geometry
+            generated = self._process_entities[entity_id]
+            gateway_mid_y = gateway_y + 25
+            validation_gateway_id = generated['validation_gateway_id']
+            
+            # Flow from processEntity to validation gateway
+            validation_flow_id = generated['validation_flow_id']
+            validation_edge = sub(plane, "bpmndi:BPMNEdge", id=f"edge_{validation_flow_id}",
+                                  bpmnElement=validation_flow_id)
+            
+            # Waypoints for processEntity to gateway
+            add_waypoint(validation_edge, original_pos.x + original_pos.width,
+                         original_pos.y + original_pos.height / 2)
+            add_waypoint(validation_edge, gateway_x, gateway_mid_y)
+            
+            # Flow from validation gateway to error end
+            error_flow_id = generated['error_flow_id']
+            error_edge = sub(plane, "bpmndi:BPMNEdge", id=f"edge_{error_flow_id}",
+                             bpmnElement=error_flow_id)
+            
+            # Waypoints for gateway to error end
+            add_waypoint(error_edge, gateway_x + 25, gateway_y + 50)
+            add_waypoint(error_edge, error_x + 18, error_y)
+            
+            # Find flows that originate from this processEntity to add success flow diagrams;
+            # they all leave from the gateway's right corner
+            gateway_right_x = gateway_x + 50
+            for flow in flows_by_source[entity_id]:
+                # This is a flow from processEntity - it should now come from the validation gateway
+                success_flow_id = f"flow_{validation_gateway_id}_to_{flow.target_id}"
+                success_edge = sub(plane, "bpmndi:BPMNEdge", id=f"edge_{success_flow_id}",
+                                   bpmnElement=success_flow_id)
                 
-                # Find flows that originate from this processEntity to add success flow diagrams
-                for flow in process.flows:
-                    if flow.source_id == element.id:
-                        # This is a flow from processEntity - it should now come from the validation gateway
-                        success_flow_id = f"flow_{generated['validation_gateway_id']}_to_{flow.target_id}"
-                        success_edge = SubElement(plane, "bpmndi:BPMNEdge")
-                        success_edge.set("id", f"edge_{success_flow_id}")
-                        success_edge.set("bpmnElement", success_flow_id)
-                        
-                        # Find target position
-                        target_pos = element_positions.get(flow.target_id)
-                        if target_pos:
-                            # Waypoints for gateway to success target
-                            wp5 = SubElement(success_edge, "di:waypoint")
-                            wp5.set("x", str(int(gateway_x + 50)))
-                            wp5.set("y", str(int(gateway_y + 25)))
-                            
-                            wp6 = SubElement(success_edge, "di:waypoint")
-                            wp6.set("x", str(int(target_pos.x)))
-                            wp6.set("y", str(int(target_pos.y + target_pos.height / 2)))
+                # Find target position
+                target_pos = element_positions.get(flow.target_id)
+                if target_pos:
+                    # Waypoints for gateway to success target
+                    add_waypoint(success_edge, gateway_right_x, gateway_mid_y)
+                    add_waypoint(success_edge, target_pos.x, target_pos.y + target_pos.height / 2)
     
     def _prettify_xml(self, element: Element) -> str:
         """Convert XML element to pretty-printed string."""
-        rough_string = tostring(element, encoding='unicode')
-        reparsed = minidom.parseString(rough_string)
-        pretty_xml = reparsed.toprettyxml(indent="  ").replace('<?xml version="1.0" ?>\n', '')
-        
-        # Don't convert &quot; back to quotes - they need to stay escaped in XML attributes
-        # The FEEL engine will handle the escaped quotes correctly
-        
-        return pretty_xml
+        # Quotes inside attribute values are serialized as &quot;, which is
+        # what Zeebe's FEEL engine expects
+        return tostring(element, encoding='unicode', pretty_print=True)
     
+    def generate_to_file(self, process: Process, file_path: str, pretty: bool = True) -> None:
+        """Generate BPMN XML and serialize the tree straight to a file.
+
+        The document is never materialized as a Python string; lxml encodes
+        and writes it incrementally.
+        """
+        definitions = self._create_definitions(process)
+
+        with open(file_path, 'wb', buffering=_WRITE_BUFFER_SIZE) as f:
+            f.write(_XML_DECLARATION)
+            ElementTree(definitions).write(f, encoding='utf-8', xml_declaration=False,
+                                           pretty_print=pretty)
+
     def save_to_file(self, process: Process, file_path: str) -> None:
         """Generate BPMN XML and save to file."""
-        xml_content = self.generate(process)
-        
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
-            f.write(xml_content)
+        self.generate_to_file(process, file_path)
 
 
 # Convenience function
@@ -817,6 +833,9 @@ def generate_bpmn(process: Process, output_file: Optional[str] = None) -> str:
     xml_content = generator.generate(process)
     
     if output_file:
-        generator.save_to_file(process, output_file)
+        # Reuse the document we already have instead of generating it twice
+        with open(output_file, 'wb', buffering=_WRITE_BUFFER_SIZE) as f:
+            f.write(_XML_DECLARATION)
+            f.write(xml_content.encode('utf-8'))
     
     return xml_content
@@ -5,9 +5,8 @@ import sys
 from pathlib import Path
 from typing import Optional
 
-from .parser import BPMParser
-from .bpmn_generator import BPMNGenerator
-from .validator import ProcessValidator
+# The parser, generator and validator are imported inside the commands that
+# use them so that --help and --version don't pay for importing lark and lxml
 
 
 @click.group()
@@ -25,48 +24,54 @@ def cli():
               help='Validate the process before generating BPMN')
 @click.option('--pretty/--no-pretty', default=True,
               help='Pretty-print the generated XML')
-def convert(input_file: Path, output: Optional[Path], validate: bool, pretty: bool):
+@click.option('--quiet', '-q', is_flag=True,
+              help='Only report validation failures and errors')
+def convert(input_file: Path, output: Optional[Path], validate: bool, pretty: bool, quiet: bool):
     """Convert a BPM DSL file to BPMN XML."""
+    # Progress output is skipped entirely with --quiet; failures are always shown
+    status = (lambda message: None) if quiet else click.echo
     try:
+        from .parser import BPMParser
+        from .validator import ProcessValidator
+
         # Parse the input file
-        click.echo(f"Parsing {input_file}...")
+        status(f"Parsing {input_file}...")
         parser = BPMParser()
         process = parser.parse_file(input_file)
         
-        click.echo(f"✓ Successfully parsed process '{process.name}' (ID: {process.id})")
+        status(f"✓ Successfully parsed process '{process.name}' (ID: {process.id})")
         
         # Validate if requested
         if validate:
-            click.echo("Validating process...")
+            status("Validating process...")
             validator = ProcessValidator()
             validation_result = validator.validate(process)
             
             if not validation_result.is_valid:
-                click.echo("❌ Validation failed:")
-                for error in validation_result.errors:
-                    click.echo(f"  • {error}")
+                click.echo("\n".join(["❌ Validation failed:"] +
+                                      [f"  • {error}" for error in validation_result.errors]))
                 sys.exit(1)
             
-            click.echo("✓ Process validation passed")
+            status("✓ Process validation passed")
         
         # Generate output file path if not specified
         if output is None:
             output = input_file.with_suffix('.bpmn')
         
         # Generate BPMN XML
-        click.echo(f"Generating BPMN XML...")
+        from .bpmn_generator import BPMNGenerator
+        status("Generating BPMN XML...")
         generator = BPMNGenerator()
         generator.save_to_file(process, str(output))
         
-        click.echo(f"✓ Successfully generated BPMN file: {output}")
-        
-        # Show process summary
-        click.echo(f"\nProcess Summary:")
-        click.echo(f"  Name: {process.name}")
-        click.echo(f"  ID: {process.id}")
-        click.echo(f"  Version: {process.version or 'N/A'}")
-        click.echo(f"  Elements: {len(process.elements)}")
-        click.echo(f"  Flows: {len(process.flows)}")
+        # Success line and process summary go out in a single write
+        status(f"✓ Successfully generated BPMN file: {output}\n"
+               "\nProcess Summary:\n"
+               f"  Name: {process.name}\n"
+               f"  ID: {process.id}\n"
+               f"  Version: {process.version or 'N/A'}\n"
+               f"  Elements: {len(process.elements)}\n"
+               f"  Flows: {len(process.flows)}")
         
     except FileNotFoundError as e:
         click.echo(f"❌ File not found: {e}", err=True)
@@ -84,6 +89,9 @@ def convert(input_file: Path, output: Optional[Path], validate: bool, pretty: bo
 def validate(input_file: Path):
     """Validate a BPM DSL file."""
     try:
+        from .parser import BPMParser
+        from .validator import ProcessValidator
+
         # Parse the input file
         click.echo(f"Parsing {input_file}...")
         parser = BPMParser()
@@ -123,6 +131,8 @@ def validate(input_file: Path):
 def info(input_file: Path):
     """Show information about a BPM DSL file."""
     try:
+        from .parser import BPMParser
+
         # Parse the input file
         parser = BPMParser()
         process = parser.parse_file(input_file)
@@ -9,54 +9,63 @@ This module implements a sophisticated layout algorithm that:
 5. Handles complex patterns like gateways, loops, and parallel branches
 """
 
-from typing import Dict, List, Tuple, Set, Optional
-from dataclasses import dataclass
-from collections import defaultdict, deque
-import math
+from typing import Dict, List, Tuple, Optional
+from dataclasses import dataclass, field
+from collections import deque
 
 from .ast_nodes import (
-    Process, Element, StartEvent, EndEvent, ScriptCall, ServiceTask, ProcessEntity,
-    Gateway, Flow, TimerEvent, BoundaryEvent, BoundaryTimerEvent, BoundaryErrorEvent,
+    Process, StartEvent, EndEvent, ScriptCall, ServiceTask, ProcessEntity,
+    Gateway, Flow, TimerEvent, BoundaryTimerEvent, BoundaryErrorEvent,
     ReceiveMessageEvent, BoundaryMessageEvent, Subprocess, CallActivity,
 )
 
 
-@dataclass
+@dataclass(slots=True)
 class Position:
     """Represents a 2D position with x, y coordinates."""
     x: float
     y: float
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Bounds:
-    """Represents element bounds with position and dimensions."""
+    """Represents element bounds with position and dimensions.
+
+    The edges and center coordinates are derived once at construction, so
+    the instance is frozen; layout code replaces a ``Bounds`` rather than
+    mutating it.
+    """
     x: float
     y: float
     width: float
     height: float
+    center_x: float = field(init=False, repr=False, compare=False)
+    center_y: float = field(init=False, repr=False, compare=False)
+    right: float = field(init=False, repr=False, compare=False)
+    bottom: float = field(init=False, repr=False, compare=False)
     
-    @property
-    def center(self) -> Position:
-        return Position(self.x + self.width / 2, self.y + self.height / 2)
+    def __post_init__(self):
+        # Frozen, so the derived fields are set past the dataclass __setattr__
+        x, y, width, height = self.x, self.y, self.width, self.height
+        set_field = object.__setattr__
+        set_field(self, 'center_x', x + width / 2)
+        set_field(self, 'center_y', y + height / 2)
+        set_field(self, 'right', x + width)
+        set_field(self, 'bottom', y + height)
     
     @property
-    def right(self) -> float:
-        return self.x + self.width
-    
-    @property
-    def bottom(self) -> float:
-        return self.y + self.height
+    def center(self) -> Position:
+        return Position(self.center_x, self.center_y)
 
 
-@dataclass
+@dataclass(slots=True)
 class Waypoint:
     """Represents a waypoint in an edge route."""
     x: float
     y: float
 
 
-@dataclass
+@dataclass(slots=True)
 class EdgeRoute:
     """Represents the routing information for an edge."""
     waypoints: List[Waypoint]
@@ -64,6 +73,23 @@ class EdgeRoute:
     target_id: str
 
 
+def _extent(positions: Dict[str, Bounds]) -> Tuple[float, float, float, float]:
+    """Return ``(min_x, min_y, max_x, max_y)`` over non-empty positions in one pass."""
+    bounds_iter = iter(positions.values())
+    first = next(bounds_iter)
+    min_x, min_y, max_x, max_y = first.x, first.y, first.right, first.bottom
+    for pos in bounds_iter:
+        if pos.x < min_x:
+            min_x = pos.x
+        if pos.y < min_y:
+            min_y = pos.y
+        if pos.right > max_x:
+            max_x = pos.right
+        if pos.bottom > max_y:
+            max_y = pos.bottom
+    return min_x, min_y, max_x, max_y
+
+
 class ProcessGraph:
     """Graph representation of a BPMN process for layout calculations."""
     
@@ -72,34 +98,46 @@ class ProcessGraph:
         self.elements = {elem.id: elem for elem in process.elements}
         # Include boundary events so they can participate in flow routing
         for elem in process.elements:
-            if isinstance(elem, (ServiceTask, Subprocess)) and elem.boundary_events:
+            kind = elem._kind
+            if (kind == 'service_task' or kind == 'subprocess') and elem.boundary_events:
                 for be in elem.boundary_events:
                     self.elements[be.id] = be
         self.flows = process.flows
-        self.adjacency = self._build_adjacency()
-        self.reverse_adjacency = self._build_reverse_adjacency()
-    
-    def _build_adjacency(self) -> Dict[str, List[str]]:
-        """Build adjacency list for forward traversal."""
-        adj = defaultdict(list)
-        for flow in self.flows:
-            adj[flow.source_id].append(flow.target_id)
-        return dict(adj)
+        self.adjacency, self.reverse_adjacency = self._build_adjacency()
     
-    def _build_reverse_adjacency(self) -> Dict[str, List[str]]:
-        """Build reverse adjacency list for backward traversal."""
-        rev_adj = defaultdict(list)
+    def _build_adjacency(self) -> Tuple[Dict[str, Tuple[str, ...]], Dict[str, Tuple[str, ...]]]:
+        """Build forward and reverse adjacency in a single pass over the flows.
+
+        Neighbors are collected in lists and frozen into tuples, which are
+        smaller and are only ever iterated by the layout.
+        """
+        adj = {}
+        rev_adj = {}
         for flow in self.flows:
-            rev_adj[flow.target_id].append(flow.source_id)
-        return dict(rev_adj)
+            source_id = flow.source_id
+            target_id = flow.target_id
+            successors = adj.get(source_id)
+            if successors is None:
+                adj[source_id] = [target_id]
+            else:
+                successors.append(target_id)
+            predecessors = rev_adj.get(target_id)
+            if predecessors is None:
+                rev_adj[target_id] = [source_id]
+            else:
+                predecessors.append(source_id)
+        return (
+            {node_id: tuple(successors) for node_id, successors in adj.items()},
+            {node_id: tuple(predecessors) for node_id, predecessors in rev_adj.items()},
+        )
     
-    def get_successors(self, node_id: str) -> List[str]:
+    def get_successors(self, node_id: str) -> Tuple[str, ...]:
         """Get successor nodes."""
-        return self.adjacency.get(node_id, [])
+        return self.adjacency.get(node_id, ())
     
-    def get_predecessors(self, node_id: str) -> List[str]:
+    def get_predecessors(self, node_id: str) -> Tuple[str, ...]:
         """Get predecessor nodes."""
-        return self.reverse_adjacency.get(node_id, [])
+        return self.reverse_adjacency.get(node_id, ())
     
     def is_gateway(self, node_id: str) -> bool:
         """Check if node is a gateway."""
@@ -142,6 +180,10 @@ class LayoutConfig:
         'subprocess_padding': 30,
     }
     
+    # Down-then-up barycenter sweeps (and at most as many transposition
+    # passes) used to order elements within levels
+    CROSSING_REDUCTION_SWEEPS = 4
+    
     MARGINS = {
         'top': 50,
         'left': 50,
@@ -156,35 +198,43 @@ class BPMNLayoutEngine:
     def __init__(self, config: LayoutConfig = None):
         self.config = config or LayoutConfig()
         self.graph: Optional[ProcessGraph] = None
-        self.levels: Dict[int, List[str]] = {}
+        self.levels: List[List[str]] = []
         self.positions: Dict[str, Bounds] = {}
-        self.edge_routes: Dict[str, EdgeRoute] = {}
+        # Keyed by (source_id, target_id) of the routed flow
+        self.edge_routes: Dict[Tuple[str, str], EdgeRoute] = {}
     
-    def calculate_layout(self, process: Process) -> Tuple[Dict[str, Bounds], Dict[str, EdgeRoute]]:
+    def calculate_layout(self, process: Process) -> Tuple[Dict[str, Bounds], Dict[Tuple[str, str], EdgeRoute]]:
         """
         Main entry point for layout calculation.
         
         Returns:
-            Tuple of (element_positions, edge_routes)
+            Tuple of (element_positions, edge_routes), with edge routes keyed
+            by the ``(source_id, target_id)`` pair of each flow
         """
         self.graph = ProcessGraph(process)
-        
+        # Start from a clean slate so one engine can lay out many processes
+        self.positions = {}
+        self.edge_routes = {}
+
         # Phase 1: Analyze structure and assign levels
         self._assign_levels()
         
-        # Phase 2: Position elements within levels
+        # Phase 2: Order elements within levels to reduce crossings
+        self._order_within_levels()
+        
+        # Phase 3: Position elements within levels
         self._position_elements()
         
-        # Phase 3: Handle gateway branches
+        # Phase 4: Handle gateway branches
         self._position_gateway_branches()
 
-        # Phase 4: Lay out subprocess internals and resize containers
+        # Phase 5: Lay out subprocess internals and resize containers
         self._layout_subprocesses()
 
-        # Phase 5: Position boundary events on parent task edges
+        # Phase 6: Position boundary events on parent task edges
         self._position_boundary_events()
 
-        # Phase 6: Calculate edge routes
+        # Phase 7: Calculate edge routes
         self._calculate_edge_routes()
         
         return self.positions, self.edge_routes
@@ -193,111 +243,235 @@ class BPMNLayoutEngine:
         """Assign elements to horizontal levels using topological sort."""
         # Find start events
         start_events = [elem_id for elem_id, elem in self.graph.elements.items() 
-                       if self.graph.is_start_event(elem_id)]
+                       if elem._kind == 'start_event']
         
         if not start_events:
             # Fallback: use elements with no predecessors
             start_events = [elem_id for elem_id in self.graph.elements.keys()
                            if not self.graph.get_predecessors(elem_id)]
         
-        # BFS level assignment
-        levels = {}
-        queue = deque([(elem_id, 0) for elem_id in start_events])
+        levels = self._longest_path_levels(start_events)
+        
+        # Longest-path levels are dense (0..L-1), so index them by position.
+        # Group in declaration order; _order_within_levels refines it
+        grouped = [[] for _ in range(max(levels.values(), default=-1) + 1)]
+        for node_id in self.graph.elements:
+            level = levels.pop(node_id, None)
+            if level is not None:
+                grouped[level].append(node_id)
+        # Flow endpoints that are not declared elements go last
+        for node_id, level in levels.items():
+            grouped[level].append(node_id)
+        self.levels = grouped
+    
+    def _longest_path_levels(self, start_events: List[str]) -> Dict[str, int]:
+        """Level every node reachable from ``start_events`` by its longest path.
+
+        A depth-first pass finds the reachable nodes and the flows that loop
+        back onto the current path; Kahn's algorithm then relaxes every other
+        flow exactly once, so leveling is linear in the size of the graph.
+        """
+        get_successors = self.graph.get_successors
+        
+        # True while a node is on the DFS path, False once it is finished
+        on_path = {}
+        back_edges = set()
+        for start_id in start_events:
+            if start_id in on_path:
+                continue
+            on_path[start_id] = True
+            stack = [(start_id, iter(get_successors(start_id)))]
+            while stack:
+                node_id, successors = stack[-1]
+                for successor in successors:
+                    state = on_path.get(successor)
+                    if state is None:
+                        on_path[successor] = True
+                        stack.append((successor, iter(get_successors(successor))))
+                        break
+                    if state:
+                        back_edges.add((node_id, successor))
+                else:
+                    on_path[node_id] = False
+                    stack.pop()
+        
+        in_degree = dict.fromkeys(on_path, 0)
+        for node_id in on_path:
+            for successor in get_successors(node_id):
+                if not back_edges or (node_id, successor) not in back_edges:
+                    in_degree[successor] += 1
         
+        levels = {node_id: 0 for node_id, degree in in_degree.items() if degree == 0}
+        queue = deque(levels)
         while queue:
-            node_id, level = queue.popleft()
-            
-            # Update level to maximum seen so far
-            if node_id in levels:
-                level = max(levels[node_id], level)
-            levels[node_id] = level
-            
-            # Add successors to next level
-            for successor in self.graph.get_successors(node_id):
-                if successor not in levels or levels[successor] < level + 1:
-                    queue.append((successor, level + 1))
+            node_id = queue.popleft()
+            next_level = levels[node_id] + 1
+            for successor in get_successors(node_id):
+                if back_edges and (node_id, successor) in back_edges:
+                    continue
+                if levels.get(successor, -1) < next_level:
+                    levels[successor] = next_level
+                in_degree[successor] -= 1
+                if not in_degree[successor]:
+                    queue.append(successor)
         
-        # Group by levels
-        self.levels = defaultdict(list)
-        for node_id, level in levels.items():
-            self.levels[level].append(node_id)
+        return levels
+    
+    def _order_within_levels(self):
+        """Reorder each level by the barycenter of its neighbors' ranks.
+
+        Alternating down and up sweeps move every node toward the average
+        rank of its predecessors (resp. successors) in earlier (resp. later)
+        levels, as in the Sugiyama/dot crossing-reduction heuristic. Nodes
+        without such neighbors keep their current rank, and ties keep their
+        current order.
+        """
+        graph = self.graph
+        level_indices = range(len(self.levels))
+        if len(level_indices) < 2:
+            return
+        
+        level_of = {}
+        rank = {}
+        for level, node_ids in enumerate(self.levels):
+            for i, node_id in enumerate(node_ids):
+                level_of[node_id] = level
+                rank[node_id] = i
+        
+        down = (level_indices[1:], graph.get_predecessors, lambda other, level: other < level)
+        up = (level_indices[-2::-1], graph.get_successors, lambda other, level: other > level)
+        for _ in range(self.config.CROSSING_REDUCTION_SWEEPS):
+            for sweep_levels, get_neighbors, is_fixed_side in (down, up):
+                for level in sweep_levels:
+                    node_ids = self.levels[level]
+                    keys = {}
+                    for node_id in node_ids:
+                        total = 0
+                        count = 0
+                        for neighbor in get_neighbors(node_id):
+                            neighbor_level = level_of.get(neighbor)
+                            if neighbor_level is not None and is_fixed_side(neighbor_level, level):
+                                total += rank[neighbor]
+                                count += 1
+                        keys[node_id] = total / count if count else rank[node_id]
+                    node_ids.sort(key=keys.__getitem__)
+                    for i, node_id in enumerate(node_ids):
+                        rank[node_id] = i
         
-        # Convert to regular dict and sort levels
-        self.levels = dict(self.levels)
-        for level in self.levels:
-            self.levels[level].sort()  # Consistent ordering
+        self._transpose_adjacent(level_of, rank)
+    
+    def _transpose_adjacent(self, level_of: Dict[str, int], rank: Dict[str, int]):
+        """Swap adjacent elements of a level whenever that removes crossings.
+
+        Swapping two neighbors only changes the crossings between their own
+        flows, so each swap strictly lowers the total and the passes stop
+        as soon as one makes no change.
+        """
+        graph = self.graph
+        # Leveled flow neighbors (both directions) with their level; ranks change as we swap
+        neighbors = {
+            node_id: [(neighbor, level_of[neighbor])
+                      for neighbor in graph.get_predecessors(node_id) + graph.get_successors(node_id)
+                      if neighbor in level_of]
+            for node_id in level_of
+        }
+        
+        for _ in range(self.config.CROSSING_REDUCTION_SWEEPS):
+            improved = False
+            for node_ids in self.levels:
+                for i in range(len(node_ids) - 1):
+                    upper = node_ids[i]
+                    lower = node_ids[i + 1]
+                    lower_neighbors = neighbors[lower]
+                    if not lower_neighbors:
+                        continue
+                    # Crossings between the two nodes' flows as ordered now vs. swapped
+                    current = swapped = 0
+                    for upper_neighbor, upper_level in neighbors[upper]:
+                        upper_rank = rank[upper_neighbor]
+                        for lower_neighbor, lower_level in lower_neighbors:
+                            if lower_level == upper_level:
+                                lower_rank = rank[lower_neighbor]
+                                if lower_rank < upper_rank:
+                                    current += 1
+                                elif upper_rank < lower_rank:
+                                    swapped += 1
+                    if current > swapped:
+                        node_ids[i] = lower
+                        node_ids[i + 1] = upper
+                        rank[lower] = i
+                        rank[upper] = i + 1
+                        improved = True
+            if not improved:
+                break
     
     def _position_elements(self):
-        """Position elements within their assigned levels."""
-        current_x = self.config.MARGINS['left']
+        """Position elements within their assigned levels.
+
+        Each level is walked once: elements are placed while the widest one
+        is tracked to advance ``x`` to the next level.
+        """
+        config = self.config
+        elements = self.graph.elements
+        dimensions = config.ELEMENT_DIMENSIONS
+        positions = self.positions
+        vertical_spacing = config.SPACING['vertical']
+        level_spacing = config.SPACING['level']
+        # Elements stack downward from a fixed offset below the top margin
+        base_y = config.MARGINS['top'] + 100
+        current_x = config.MARGINS['left']
         
-        for level in sorted(self.levels.keys()):
-            elements_in_level = self.levels[level]
-            level_width = self._calculate_level_width(elements_in_level)
-            
-            # Center elements vertically in level
-            current_y = self.config.MARGINS['top']
-            
-            for i, elem_id in enumerate(elements_in_level):
-                element = self.graph.elements[elem_id]
-                dims = self.config.ELEMENT_DIMENSIONS[type(element)]
-                
-                # Calculate vertical position
-                if len(elements_in_level) > 1:
-                    vertical_spacing = self.config.SPACING['vertical']
-                    total_height = (len(elements_in_level) - 1) * vertical_spacing
-                    start_y = self.config.MARGINS['top'] + 100  # Base offset
-                    y = start_y + i * vertical_spacing
-                else:
-                    y = current_y + 100  # Single element, center it
+        for level_elements in self.levels:
+            level_width = 0
+            for i, elem_id in enumerate(level_elements):
+                element = elements[elem_id]
+                dims = dimensions.get(type(element)) or self._element_dimensions(element)
+                width = dims['width']
+                if width > level_width:
+                    level_width = width
                 
-                self.positions[elem_id] = Bounds(
+                positions[elem_id] = Bounds(
                     x=current_x,
-                    y=y,
-                    width=dims['width'],
+                    y=base_y + i * vertical_spacing,
+                    width=width,
                     height=dims['height']
                 )
             
-            current_x += level_width + self.config.SPACING['level']
-    
-    def _calculate_level_width(self, elements_in_level: List[str]) -> float:
-        """Calculate the width needed for a level."""
-        if not elements_in_level:
-            return 0
-        
-        max_width = 0
-        for elem_id in elements_in_level:
-            element = self.graph.elements[elem_id]
-            dims = self.config.ELEMENT_DIMENSIONS[type(element)]
-            max_width = max(max_width, dims['width'])
-        
-        return max_width
+            current_x += level_width + level_spacing
     
+    def _element_dimensions(self, element) -> Dict[str, int]:
+        """Look up dimensions for a subclass of a known element type via its MRO."""
+        dimensions = self.config.ELEMENT_DIMENSIONS
+        for base in type(element).__mro__:
+            if base in dimensions:
+                return dimensions[base]
+        raise KeyError(type(element))
+
     def _position_gateway_branches(self):
         """Handle special positioning for gateway branches."""
-        for elem_id, element in self.graph.elements.items():
-            if not self.graph.is_gateway(elem_id):
+        graph = self.graph
+        positions = self.positions
+        branch_spacing = self.config.SPACING['gateway_branch']
+        
+        for elem_id, element in graph.elements.items():
+            if element._kind != 'gateway':
                 continue
             
-            successors = self.graph.get_successors(elem_id)
+            successors = graph.get_successors(elem_id)
             if len(successors) <= 1:
                 continue  # Not a splitting gateway
             
-            # Get gateway position
-            gateway_pos = self.positions[elem_id]
-            
-            # Calculate branch positions
-            branch_spacing = self.config.SPACING['gateway_branch']
+            # Calculate branch positions around the gateway's center
             total_height = (len(successors) - 1) * branch_spacing
-            start_y = gateway_pos.center.y - total_height / 2
+            start_y = positions[elem_id].center_y - total_height / 2
             
             for i, successor_id in enumerate(successors):
-                if successor_id in self.positions:
+                successor_pos = positions.get(successor_id)
+                if successor_pos is not None:
                     # Adjust y position for branch
-                    successor_pos = self.positions[successor_id]
                     new_y = start_y + i * branch_spacing - successor_pos.height / 2
                     
-                    self.positions[successor_id] = Bounds(
+                    positions[successor_id] = Bounds(
                         x=successor_pos.x,
                         y=new_y,
                         width=successor_pos.width,
@@ -307,7 +481,7 @@ class BPMNLayoutEngine:
     def _layout_subprocesses(self):
         """Lay out subprocess internals and resize containers to fit children."""
         for elem_id, element in self.graph.elements.items():
-            if not isinstance(element, Subprocess):
+            if element._kind != 'subprocess':
                 continue
             if not element.elements:
                 continue
@@ -330,10 +504,7 @@ class BPMNLayoutEngine:
                 continue
 
             # Compute bounding box of child elements
-            child_min_x = min(p.x for p in child_positions.values())
-            child_min_y = min(p.y for p in child_positions.values())
-            child_max_x = max(p.right for p in child_positions.values())
-            child_max_y = max(p.bottom for p in child_positions.values())
+            child_min_x, child_min_y, child_max_x, child_max_y = _extent(child_positions)
 
             padding = self.config.SPACING['subprocess_padding']
 
@@ -375,7 +546,8 @@ class BPMNLayoutEngine:
     def _position_boundary_events(self):
         """Position boundary events on the bottom edge of their parent task or subprocess."""
         for elem_id, element in self.graph.elements.items():
-            if not isinstance(element, (ServiceTask, Subprocess)):
+            kind = element._kind
+            if kind != 'service_task' and kind != 'subprocess':
                 continue
             if not element.boundary_events:
                 continue
@@ -406,8 +578,10 @@ class BPMNLayoutEngine:
     def _calculate_edge_routes(self):
         """Calculate routing for all edges."""
         for flow in self.graph.flows:
-            source_pos = self.positions.get(flow.source_id)
-            target_pos = self.positions.get(flow.target_id)
+            source_id = flow.source_id
+            target_id = flow.target_id
+            source_pos = self.positions.get(source_id)
+            target_pos = self.positions.get(target_id)
             
             if not source_pos or not target_pos:
                 continue
@@ -415,48 +589,41 @@ class BPMNLayoutEngine:
             # Calculate waypoints
             waypoints = self._calculate_waypoints(source_pos, target_pos, flow)
             
-            flow_id = f"flow_{flow.source_id}_to_{flow.target_id}"
-            self.edge_routes[flow_id] = EdgeRoute(
+            self.edge_routes[source_id, target_id] = EdgeRoute(
                 waypoints=waypoints,
-                source_id=flow.source_id,
-                target_id=flow.target_id
+                source_id=source_id,
+                target_id=target_id
             )
     
     def _calculate_waypoints(self, source_pos: Bounds, target_pos: Bounds, flow: Flow) -> List[Waypoint]:
         """Calculate waypoints for an edge route."""
         # Start from right edge of source
         start_x = source_pos.right
-        start_y = source_pos.center.y
+        start_y = source_pos.center_y
         
         # End at left edge of target
         end_x = target_pos.x
-        end_y = target_pos.center.y
-        
-        waypoints = [Waypoint(start_x, start_y)]
+        end_y = target_pos.center_y
         
         # If elements are on same horizontal level, use straight line
         if abs(start_y - end_y) < 10:  # Tolerance for "same level"
-            waypoints.append(Waypoint(end_x, end_y))
-        else:
-            # Use orthogonal routing
-            mid_x = start_x + (end_x - start_x) / 2
-            waypoints.extend([
-                Waypoint(mid_x, start_y),
-                Waypoint(mid_x, end_y),
-                Waypoint(end_x, end_y)
-            ])
+            return [Waypoint(start_x, start_y), Waypoint(end_x, end_y)]
         
-        return waypoints
+        # Use orthogonal routing
+        mid_x = start_x + (end_x - start_x) / 2
+        return [
+            Waypoint(start_x, start_y),
+            Waypoint(mid_x, start_y),
+            Waypoint(mid_x, end_y),
+            Waypoint(end_x, end_y)
+        ]
     
     def get_diagram_bounds(self) -> Bounds:
         """Calculate the total bounds of the diagram."""
         if not self.positions:
             return Bounds(0, 0, 100, 100)
         
-        min_x = min(pos.x for pos in self.positions.values())
-        min_y = min(pos.y for pos in self.positions.values())
-        max_x = max(pos.right for pos in self.positions.values())
-        max_y = max(pos.bottom for pos in self.positions.values())
+        min_x, min_y, max_x, max_y = _extent(self.positions)
         
         return Bounds(
             x=min_x - self.config.MARGINS['left'],
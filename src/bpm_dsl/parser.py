@@ -1,7 +1,9 @@
 """BPM DSL Parser using Lark."""
 
-import os
+import copy
+import functools
 import re
+import sys
 from pathlib import Path
 from typing import List, Optional, Union
 from lark import Lark, Transformer, v_args
@@ -9,7 +11,7 @@ from lark.exceptions import LarkError
 
 from .ast_nodes import (
     Process, StartEvent, EndEvent, ScriptCall, ServiceTask, ProcessEntity, Gateway,
-    Flow, Element, ASTNode, VariableMapping, TaskHeader,
+    Flow, Element, VariableMapping, TaskHeader,
     TimerDefinition, TimerEvent, BoundaryTimerEvent, BoundaryErrorEvent,
     BoundaryMessageEvent, BoundaryEvent, ReceiveMessageEvent,
     Subprocess, CallActivity,
@@ -61,8 +63,17 @@ def desugar_duration(shorthand: str) -> str:
     return result
 
 
+# Patterns used by to_kebab_case, compiled once at import
+_NON_WORD_RE = re.compile(r'[^\w\s]')
+_SEPARATOR_RUN_RE = re.compile(r'[\s_]+')
+
+
+@functools.lru_cache(maxsize=2048)
 def to_kebab_case(name: str) -> str:
     """Convert a name to kebab-case for use as an ID.
+
+    The function is pure, so results are memoized: names such as
+    "Start" or "End" recur across elements and repeated parses.
     
     Examples:
         "Process Data" -> "process-data"
@@ -70,10 +81,12 @@ def to_kebab_case(name: str) -> str:
         "Start Demo" -> "start-demo"
     """
     # Remove quotes and special characters, keep alphanumeric and spaces
-    clean_name = re.sub(r'[^\w\s]', '', name)
+    clean_name = _NON_WORD_RE.sub('', name)
     # Replace spaces and underscores with hyphens, convert to lowercase
-    kebab_name = re.sub(r'[\s_]+', '-', clean_name.strip()).lower()
-    return kebab_name
+    kebab_name = _SEPARATOR_RUN_RE.sub('-', clean_name.strip()).lower()
+    # IDs become dict keys throughout layout and generation; interned
+    # strings let those lookups succeed on identity
+    return sys.intern(kebab_name)
 
 
 class BPMTransformer(Transformer):
@@ -111,17 +124,21 @@ class BPMTransformer(Transformer):
     @v_args(inline=True)
     def OTHERWISE(self, s):
         """Mark otherwise token."""
-        return {"is_default": True}
+        return ('is_default', True)
     
     @v_args(inline=True)
     def process(self, name: str, body: dict) -> Process:
-        """Create a Process node."""
+        """Create a Process node.
+
+        ``process_body`` always fills in every key, so they are read
+        directly; a process without an ``id:`` keeps ``id=None``.
+        """
         return Process(
             name=name,
-            id=body.get('id', f"process_{name.lower().replace(' ', '_')}"),
-            version=body.get('version'),
-            elements=body.get('elements', []),
-            flows=body.get('flows', []),
+            id=body['id'],
+            version=body['version'],
+            elements=body['elements'],
+            flows=body['flows'],
             openapi_file_path=self.openapi_file_path
         )
     
@@ -135,33 +152,27 @@ class BPMTransformer(Transformer):
         }
         
         for item in items:
-            if isinstance(item, dict):
-                if 'flows' in item:
-                    result['flows'] = item['flows']
-                else:
-                    result.update(item)
-            elif isinstance(item, Element):
+            if type(item) is tuple:
+                key, value = item
+                result[key] = value
+            else:
                 result['elements'].append(item)
         
         return result
     
-    def process_metadata(self, items) -> dict:
-        """Extract process metadata."""
-        result = {}
-        for item in items:
-            if isinstance(item, dict):
-                result.update(item)
-        return result
+    def process_metadata(self, items) -> tuple:
+        """Extract process metadata (exactly one id or version property)."""
+        return items[0]
     
     @v_args(inline=True)
-    def process_id(self, id_value: str) -> dict:
+    def process_id(self, id_value: str) -> tuple:
         """Extract process ID."""
-        return {'id': id_value}
+        return ('id', sys.intern(id_value))
     
     @v_args(inline=True)
-    def process_version(self, version: str) -> dict:
+    def process_version(self, version: str) -> tuple:
         """Extract process version."""
-        return {'version': version}
+        return ('version', version)
     
     def element(self, items) -> Element:
         """Extract element from parse tree."""
@@ -264,9 +275,13 @@ class BPMTransformer(Transformer):
         properties = {}
         boundary_events = []
         for item in items:
-            if isinstance(item, BoundaryEvent):
+            if type(item) is tuple:
+                key, value = item
+                properties[key] = value
+            elif isinstance(item, BoundaryEvent):
                 boundary_events.append(item)
-            elif isinstance(item, dict):
+            else:
+                # multi_instance contributes a list of properties
                 properties.update(item)
         if boundary_events:
             properties['boundary_events'] = boundary_events
@@ -281,90 +296,81 @@ class BPMTransformer(Transformer):
         return self._extract_properties(items)
     
     def _extract_properties(self, items) -> dict:
-        """Helper to extract properties from items."""
-        properties = {}
-        for item in items:
-            if isinstance(item, dict):
-                properties.update(item)
-        return properties
+        """Helper to build a properties dict from ``(key, value)`` items."""
+        return dict(items)
     
     @v_args(inline=True)
-    def element_id(self, id_value: str) -> dict:
+    def element_id(self, id_value: str) -> tuple:
         """Extract element ID."""
-        return {'id': id_value}
+        return ('id', sys.intern(id_value))
     
     @v_args(inline=True)
-    def script_code(self, script: str) -> dict:
+    def script_code(self, script: str) -> tuple:
         """Extract script code."""
-        return {'script': script}
+        return ('script', script)
     
     @v_args(inline=True)
-    def input_mappings(self, mappings_list: List[VariableMapping]) -> dict:
+    def input_mappings(self, mappings_list: List[VariableMapping]) -> tuple:
         """Extract input variable mappings."""
-        return {'input_mappings': mappings_list}
+        return ('input_mappings', mappings_list)
     
     @v_args(inline=True)
-    def output_mappings(self, mappings_list: List[VariableMapping]) -> dict:
+    def output_mappings(self, mappings_list: List[VariableMapping]) -> tuple:
         """Extract output variable mappings."""
-        return {'output_mappings': mappings_list}
+        return ('output_mappings', mappings_list)
     
     @v_args(inline=True)
-    def input_vars(self, vars_list: List[str]) -> dict:
+    def input_vars(self, vars_list: List[str]) -> tuple:
         """Extract input variables and convert to simple mappings."""
         mappings = [VariableMapping(source=var, target=var) for var in vars_list]
-        return {'input_mappings': mappings}
+        return ('input_mappings', mappings)
     
     @v_args(inline=True)
-    def output_vars(self, vars_list: List[str]) -> dict:
+    def output_vars(self, vars_list: List[str]) -> tuple:
         """Extract output variables and convert to simple mappings."""
         mappings = [VariableMapping(source=var, target=var) for var in vars_list]
-        return {'output_mappings': mappings}
+        return ('output_mappings', mappings)
     
     @v_args(inline=True)
-    def result_variable(self, result_var: str) -> dict:
+    def result_variable(self, result_var: str) -> tuple:
         """Extract result variable."""
-        return {'result_variable': result_var}
+        return ('result_variable', result_var)
     
     @v_args(inline=True)
-    def task_type(self, type_value: str) -> dict:
+    def task_type(self, type_value: str) -> tuple:
         """Extract service task type."""
-        return {'task_type': type_value}
+        return ('task_type', type_value)
     
     @v_args(inline=True)
-    def task_retries(self, retries_value) -> dict:
+    def task_retries(self, retries_value) -> tuple:
         """Extract service task retries."""
-        return {'retries': int(retries_value)}
+        return ('retries', int(retries_value))
     
     @v_args(inline=True)
-    def task_headers(self, headers_list: List[TaskHeader]) -> dict:
+    def task_headers(self, headers_list: List[TaskHeader]) -> tuple:
         """Extract service task headers."""
-        return {'headers': headers_list}
+        return ('headers', headers_list)
     
     @v_args(inline=True)
-    def entity_type(self, type_value: str) -> dict:
+    def entity_type(self, type_value: str) -> tuple:
         """Extract process entity type."""
-        return {'entity_type': type_value}
+        return ('entity_type', type_value)
     
     
     @v_args(inline=True)
-    def entity_name(self, name_value: str) -> dict:
+    def entity_name(self, name_value: str) -> tuple:
         """Extract process entity name."""
-        return {'entity_name': name_value}
+        return ('entity_name', name_value)
     
     @v_args(inline=True)
-    def gateway_type(self, type_value) -> dict:
+    def gateway_type(self, type_value) -> tuple:
         """Extract gateway type (xor, parallel)."""
-        return {'gateway_type': str(type_value)}
+        return ('gateway_type', str(type_value))
 
     @v_args(inline=True)
-    def gateway_condition(self, when: str) -> dict:
+    def gateway_condition(self, when: str) -> tuple:
         """Extract gateway when condition."""
-        return {'condition': when}
-
-    @v_args(inline=True)
-    def gateway_type(self, type_value: str) -> dict:
-        """Extract gateway type (xor, parallel)."""
-        return {'gateway_type': type_value}
+        return ('condition', when)
 
     # ── Timer element transformers ──────────────────────────────────
 
@@ -383,19 +389,19 @@ class BPMTransformer(Transformer):
         return str(raw)
 
     @v_args(inline=True)
-    def timer_duration(self, duration: str) -> dict:
+    def timer_duration(self, duration: str) -> tuple:
         """Extract timer duration property."""
-        return {'duration': duration}
+        return ('duration', duration)
 
     @v_args(inline=True)
-    def timer_date(self, date: str) -> dict:
+    def timer_date(self, date: str) -> tuple:
         """Extract timer date property."""
-        return {'date': date}
+        return ('date', date)
 
     @v_args(inline=True)
-    def timer_cycle(self, cycle: str) -> dict:
+    def timer_cycle(self, cycle: str) -> tuple:
         """Extract timer cycle property."""
-        return {'cycle': cycle}
+        return ('cycle', cycle)
 
     @v_args(inline=True)
     def cycle_expr(self, duration: str) -> str:
@@ -421,26 +427,26 @@ class BPMTransformer(Transformer):
         return TimerEvent(name=name, id=element_id, timer=timer_def)
 
     @v_args(inline=True)
-    def start_timer(self, cycle: str) -> dict:
+    def start_timer(self, cycle: str) -> tuple:
         """Extract timer for a start event (always a cycle)."""
-        return {'timer': TimerDefinition(cycle=cycle)}
+        return ('timer', TimerDefinition(cycle=cycle))
 
     @v_args(inline=True)
-    def start_message(self, message: str) -> dict:
+    def start_message(self, message: str) -> tuple:
         """Extract message name for a message start event."""
-        return {'message': message}
+        return ('message', message)
 
     # ── Boundary event transformers ──────────────────────────────────
 
     @v_args(inline=True)
-    def boundary_interrupting(self, value: bool) -> dict:
+    def boundary_interrupting(self, value: bool) -> tuple:
         """Extract the interrupting flag."""
-        return {'interrupting': value}
+        return ('interrupting', value)
 
     @v_args(inline=True)
-    def error_code(self, code: str) -> dict:
+    def error_code(self, code: str) -> tuple:
         """Extract the errorCode property."""
-        return {'error_code': code}
+        return ('error_code', code)
 
     def on_timer_properties(self, items) -> dict:
         """Collect onTimer boundary event properties."""
@@ -479,14 +485,14 @@ class BPMTransformer(Transformer):
     # ── Message event transformers ──────────────────────────────────
 
     @v_args(inline=True)
-    def message_name(self, name: str) -> dict:
+    def message_name(self, name: str) -> tuple:
         """Extract message name property."""
-        return {'message': name}
+        return ('message', name)
 
     @v_args(inline=True)
-    def correlation_key(self, key: str) -> dict:
+    def correlation_key(self, key: str) -> tuple:
         """Extract correlation key property."""
-        return {'correlation_key': key}
+        return ('correlation_key', key)
 
     def receive_message_properties(self, items) -> dict:
         """Collect receiveMessage element properties."""
@@ -530,23 +536,23 @@ class BPMTransformer(Transformer):
     # ── Multi-instance transformers ────────────────────────────────
 
     @v_args(inline=True)
-    def for_each(self, collection: str) -> dict:
+    def for_each(self, collection: str) -> tuple:
         """Extract forEach collection variable."""
-        return {'for_each': collection}
+        return ('for_each', collection)
 
     @v_args(inline=True)
-    def for_each_as(self, var: str) -> dict:
+    def for_each_as(self, var: str) -> tuple:
         """Extract the loop element variable name."""
-        return {'as_var': var}
+        return ('as_var', var)
 
     @v_args(inline=True)
-    def for_each_parallel(self, value: bool) -> dict:
+    def for_each_parallel(self, value: bool) -> tuple:
         """Extract the parallel flag."""
-        return {'parallel': value}
+        return ('parallel', value)
 
-    def multi_instance(self, items) -> dict:
+    def multi_instance(self, items) -> list:
         """Collect multi-instance modifier properties (forEach/as/parallel)."""
-        return self._extract_properties(items)
+        return items
 
     # ── Subprocess transformers ────────────────────────────────────
 
@@ -556,11 +562,15 @@ class BPMTransformer(Transformer):
         elements = []
         boundary_events = []
         for item in items:
-            if isinstance(item, BoundaryEvent):
+            if type(item) is tuple:
+                key, value = item
+                properties[key] = value
+            elif isinstance(item, BoundaryEvent):
                 boundary_events.append(item)
             elif isinstance(item, Element):
                 elements.append(item)
-            elif isinstance(item, dict):
+            else:
+                # multi_instance contributes a list of properties
                 properties.update(item)
         if elements:
             properties['elements'] = elements
@@ -594,14 +604,14 @@ class BPMTransformer(Transformer):
     # ── Call Activity transformers ─────────────────────────────────
 
     @v_args(inline=True)
-    def process_ref(self, ref: str) -> dict:
+    def process_ref(self, ref: str) -> tuple:
         """Extract processId reference."""
-        return {'process_id': ref}
+        return ('process_id', ref)
 
     @v_args(inline=True)
-    def propagate_all_variables(self, value: bool) -> dict:
+    def propagate_all_variables(self, value: bool) -> tuple:
         """Extract propagateAllVariables flag."""
-        return {'propagate_all_variables': value}
+        return ('propagate_all_variables', value)
 
     def call_activity_properties(self, items) -> dict:
         """Collect callActivity properties."""
@@ -619,57 +629,52 @@ class BPMTransformer(Transformer):
             output_mappings=properties.get('output_mappings', []),
         )
 
-    def flow_section(self, items) -> dict:
+    def flow_section(self, items) -> tuple:
         """Create flow section."""
-        flows = [item for item in items if isinstance(item, Flow)]
-        return {'flows': flows}
+        # Only flow_definition children survive; the keyword and braces
+        # are anonymous tokens that Lark filters out
+        return ('flows', items)
     
     def flow_definition(self, items) -> Flow:
         """Create a Flow node."""
-        source_id = items[0]
-        target_id = items[1]
+        # Interned so they share one object with the element IDs they reference
+        source_id = sys.intern(items[0])
+        target_id = sys.intern(items[1])
         condition = None
         is_default = False
         
         if len(items) > 2:
-            flow_condition_result = items[2]
-            if isinstance(flow_condition_result, dict):
-                if flow_condition_result.get('is_default'):
-                    is_default = True
-                else:
-                    condition = flow_condition_result.get('condition')
-            elif isinstance(flow_condition_result, str):
-                condition = flow_condition_result
+            key, value = items[2]
+            if key == 'is_default':
+                is_default = value
+            else:
+                condition = value
         
         return Flow(source_id=source_id, target_id=target_id, condition=condition, is_default=is_default)
     
     def flow_condition(self, items):
-        """Extract flow condition or otherwise (default) marker."""
-        if len(items) == 1:
-            item = items[0]
-            # OTHERWISE terminal is transformed into {'is_default': True}
-            if isinstance(item, dict) and item.get('is_default'):
-                return {'is_default': True}
-            # Fallback: check for OTHERWISE token type
-            if hasattr(item, 'type') and item.type == "OTHERWISE":
-                return {'is_default': True}
-            elif hasattr(item, 'value') and item.value == "otherwise":
-                return {'is_default': True}
-            else:
-                return {'condition': item}
-        return {'condition': None}
+        """Extract flow condition or otherwise (default) marker.
+
+        Both grammar alternatives yield exactly one child: the ``when:``
+        string, or the OTHERWISE terminal already transformed into
+        ``('is_default', True)``.
+        """
+        item = items[0]
+        if type(item) is tuple:
+            return item
+        return ('condition', item)
     
     def string_array(self, items) -> List[str]:
         """Create string array."""
-        return [item for item in items if isinstance(item, str)]
+        return items
     
     def mapping_array(self, items) -> List[VariableMapping]:
         """Create variable mapping array."""
-        return [item for item in items if isinstance(item, VariableMapping)]
+        return items
     
     def header_array(self, items) -> List[TaskHeader]:
         """Create task header array."""
-        return [item for item in items if isinstance(item, TaskHeader)]
+        return items
     
     @v_args(inline=True)
     def variable_mapping(self, source: str, target: str) -> VariableMapping:
@@ -682,21 +687,43 @@ class BPMTransformer(Transformer):
         return TaskHeader(key=key, value=value)
 
 
+_GRAMMAR_PATH = Path(__file__).parent / "grammar.lark"
+
+
+@functools.lru_cache(maxsize=None)
+def _get_lark() -> Lark:
+    """Build the LALR parser once per process.
+
+    The transformer keeps no per-parse state, so one Lark instance serves
+    every BPMParser. ``cache=True`` stores Lark's pickled grammar analysis
+    in the temp directory so later interpreter runs skip building it.
+    """
+    return Lark(
+        _GRAMMAR_PATH.read_text(encoding='utf-8'),
+        parser='lalr',
+        transformer=BPMTransformer(),
+        start='start',
+        cache=True
+    )
+
+
+def _read_bpm_file(file_path: Path) -> str:
+    """Read a .bpm file, letting open() itself report a missing file."""
+    try:
+        return file_path.read_text(encoding='utf-8')
+    except FileNotFoundError:
+        raise FileNotFoundError(f"File not found: {file_path}") from None
+
+
 class BPMParser:
     """Main parser for BPM DSL files."""
     
+    __slots__ = ('openapi_file_path', 'parser')
+    
     def __init__(self, openapi_file_path: Optional[str] = None):
-        """Initialize the parser with the grammar."""
-        grammar_path = Path(__file__).parent / "grammar.lark"
-        with open(grammar_path, 'r') as f:
-            grammar = f.read()
-        
-        self.parser = Lark(
-            grammar,
-            parser='lalr',
-            transformer=BPMTransformer(openapi_file_path),
-            start='start'
-        )
+        """Initialize the parser with the shared grammar."""
+        self.openapi_file_path = openapi_file_path
+        self.parser = _get_lark()
     
     def parse_file(self, file_path: Union[str, Path]) -> Process:
         """Parse a BPM DSL file and return the AST.
@@ -704,31 +731,17 @@ class BPMParser:
         Validates that a corresponding OpenAPI YAML file exists with the same base name.
         """
         file_path = Path(file_path)
-        
-        if not file_path.exists():
-            raise FileNotFoundError(f"File not found: {file_path}")
+        content = _read_bpm_file(file_path)
         
         # Validate and get the OpenAPI YAML file path
         openapi_file_path = self._validate_openapi_file(file_path)
         
-        # Re-initialize parser with the OpenAPI file path
-        grammar_path = Path(__file__).parent / "grammar.lark"
-        with open(grammar_path, 'r') as f:
-            grammar = f.read()
-        
-        self.parser = Lark(
-            grammar,
-            parser='lalr',
-            transformer=BPMTransformer(str(openapi_file_path)),
-            start='start'
-        )
-        
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        return self.parse_string(content)
+        process = self.parse_string(content)
+        process.openapi_file_path = str(openapi_file_path)
+        return process
     
-    def _validate_openapi_file(self, bpm_file_path: Path) -> Path:
+    @staticmethod
+    def _validate_openapi_file(bpm_file_path: Path) -> Path:
         """Validate that a matching OpenAPI YAML file exists for the .bpm file.
         
         Args:
@@ -761,19 +774,45 @@ class BPMParser:
         """Parse a BPM DSL string and return the AST."""
         try:
             result = self.parser.parse(content)
+            result.openapi_file_path = self.openapi_file_path
             return result
         except LarkError as e:
             raise ValueError(f"Parse error: {e}")
 
 
+_DEFAULT_PARSER: Optional[BPMParser] = None
+
+
+def _get_parser() -> BPMParser:
+    """Return the shared module-level parser, building it on first use."""
+    global _DEFAULT_PARSER
+    if _DEFAULT_PARSER is None:
+        _DEFAULT_PARSER = BPMParser()
+    return _DEFAULT_PARSER
+
+
+@functools.lru_cache(maxsize=128)
+def _cached_parse(content: str, openapi_file_path: Optional[str] = None) -> Process:
+    """Parse DSL text once per (content, OpenAPI path) pair.
+
+    The cached AST is never handed out directly: callers receive a deep
+    copy so that mutations (e.g. by the BPMN generator) cannot leak into
+    later parses of the same text.
+    """
+    process = _get_parser().parse_string(content)
+    process.openapi_file_path = openapi_file_path
+    return process
+
+
 # Convenience function
 def parse_bpm_file(file_path: Union[str, Path]) -> Process:
     """Parse a BPM file and return the process AST."""
-    parser = BPMParser()
-    return parser.parse_file(file_path)
+    file_path = Path(file_path)
+    content = _read_bpm_file(file_path)
+    openapi_file_path = BPMParser._validate_openapi_file(file_path)
+    return copy.deepcopy(_cached_parse(content, str(openapi_file_path)))
 
 
 def parse_bpm_string(content: str) -> Process:
     """Parse a BPM string and return the process AST."""
-    parser = BPMParser()
-    return parser.parse_string(content)
+    return copy.deepcopy(_cached_parse(content))
@@ -1,29 +1,52 @@
 """Process validation for BPM DSL."""
 
 import re
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import List, Set, Dict
 from collections import defaultdict
 
 from .ast_nodes import (
-    Process, StartEvent, EndEvent, ScriptCall, ServiceTask, ProcessEntity,
-    Gateway, Flow, TimerEvent, TimerDefinition,
-    BoundaryEvent, BoundaryTimerEvent, BoundaryErrorEvent,
+    Process, Element, StartEvent, EndEvent, ScriptCall, ServiceTask, ProcessEntity,
+    Gateway, TimerEvent, TimerDefinition,
+    BoundaryTimerEvent, BoundaryErrorEvent,
     BoundaryMessageEvent, ReceiveMessageEvent,
     Subprocess, CallActivity,
 )
 
 
-@dataclass
+# Characters allowed after the first one in an XML ID: \w is exactly
+# str.isalnum() plus '_', so this matches the per-character rule in C
+_XML_ID_TAIL_RE = re.compile(r'[\w.\-]*')
+
+# Any comparison or boolean token marks a plausible condition ('>=' and
+# '<=' are covered by '>' and '<'); one search replaces ten substring scans
+_CONDITION_TOKEN_RE = re.compile(r'==|!=|[<>]|&&|\|\||true|false')
+
+
+@dataclass(slots=True)
 class ValidationResult:
     """Result of process validation."""
     is_valid: bool
     errors: List[str]
-    warnings: List[str] = None
-    
-    def __post_init__(self):
-        if self.warnings is None:
-            self.warnings = []
+    warnings: List[str] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class _ValidationContext:
+    """Element and flow indexes shared by the validation passes.
+
+    Built once per ``validate`` call from a single walk over the elements
+    and one over the flows, so the passes stop rebuilding the same sets.
+    """
+    element_ids: Set[str]
+    element_lookup: Dict[str, Element]
+    start_events: List[StartEvent]
+    end_events: List[EndEvent]
+    process_entities: List[ProcessEntity]
+    script_calls: List[ScriptCall]
+    outgoing: Dict[str, List[str]]
+    incoming: Dict[str, List[str]]
+    flow_endpoint_ids: Set[str]
 
 
 class ProcessValidator:
@@ -33,32 +56,43 @@ class ProcessValidator:
         """Validate a process and return validation result."""
         errors = []
         warnings = []
+        ctx = self._build_context(process)
         
         # Basic process validation
         errors.extend(self._validate_process_basic(process))
         
         # Element validation
-        errors.extend(self._validate_elements(process))
+        errors.extend(self._validate_elements(process, ctx))
+
+        # A process without elements has already been reported as missing its
+        # start, end and processEntity; later passes would only add noise such
+        # as one "non-existent element" error per flow endpoint
+        if not process.elements:
+            return ValidationResult(
+                is_valid=False,
+                errors=errors,
+                warnings=self._generate_warnings(process, ctx)
+            )
 
         # Timer, message, and boundary event validation
         errors.extend(self._validate_timer_events(process))
         errors.extend(self._validate_message_start_events(process))
-        errors.extend(self._validate_boundary_events(process))
+        errors.extend(self._validate_boundary_events(process, ctx))
 
         # Composition validation (subprocess, callActivity, multi-instance)
-        errors.extend(self._validate_composition(process))
+        errors.extend(self._validate_composition(process, ctx))
 
         # Flow validation
-        errors.extend(self._validate_flows(process))
+        errors.extend(self._validate_flows(process, ctx))
 
         # Structural validation
-        errors.extend(self._validate_structure(process))
+        errors.extend(self._validate_structure(process, ctx))
         
         # Zeebe-specific validation
-        errors.extend(self._validate_zeebe_compatibility(process))
+        errors.extend(self._validate_zeebe_compatibility(process, ctx))
         
         # Generate warnings
-        warnings.extend(self._generate_warnings(process))
+        warnings.extend(self._generate_warnings(process, ctx))
         
         return ValidationResult(
             is_valid=len(errors) == 0,
@@ -66,14 +100,56 @@ class ProcessValidator:
             warnings=warnings
         )
     
+    def _build_context(self, process: Process) -> _ValidationContext:
+        """Index the process elements and flows for the validation passes."""
+        element_lookup = {}
+        start_events = []
+        end_events = []
+        process_entities = []
+        script_calls = []
+        for element in process.elements:
+            element_lookup[element.id] = element
+            kind = element._kind
+            if kind == 'start_event':
+                start_events.append(element)
+            elif kind == 'end_event':
+                end_events.append(element)
+            elif kind == 'process_entity':
+                process_entities.append(element)
+            elif kind == 'script_call':
+                script_calls.append(element)
+        
+        outgoing = defaultdict(list)
+        incoming = defaultdict(list)
+        flow_endpoint_ids = set()
+        for flow in process.flows:
+            source_id = flow.source_id
+            target_id = flow.target_id
+            outgoing[source_id].append(target_id)
+            incoming[target_id].append(source_id)
+            flow_endpoint_ids.add(source_id)
+            flow_endpoint_ids.add(target_id)
+        
+        return _ValidationContext(
+            element_ids=set(element_lookup),
+            element_lookup=element_lookup,
+            start_events=start_events,
+            end_events=end_events,
+            process_entities=process_entities,
+            script_calls=script_calls,
+            outgoing=outgoing,
+            incoming=incoming,
+            flow_endpoint_ids=flow_endpoint_ids,
+        )
+    
     def _validate_process_basic(self, process: Process) -> List[str]:
         """Validate basic process properties."""
         errors = []
         
-        if not process.name or not process.name.strip():
+        if not process.name or process.name.isspace():
             errors.append("Process must have a non-empty name")
         
-        if not process.id or not process.id.strip():
+        if not process.id or process.id.isspace():
             errors.append("Process must have a non-empty ID")
         
         # Validate ID format (should be valid XML ID)
@@ -82,12 +158,20 @@ class ProcessValidator:
         
         return errors
     
-    def _validate_elements(self, process: Process) -> List[str]:
+    def _validate_elements(self, process: Process, ctx: _ValidationContext) -> List[str]:
         """Validate process elements."""
         errors = []
         element_ids = set()
-        start_events = []
-        end_events = []
+        # Type-specific checks keyed by element kind; start/end events are
+        # counted from ctx, Subprocess and TimerEvent are validated separately
+        type_validators = {
+            'script_call': self._validate_script_call,
+            'service_task': self._validate_service_task,
+            'process_entity': self._validate_process_entity,
+            'receive_message_event': self._validate_receive_message,
+            'gateway': self._validate_gateway,
+            'call_activity': self._validate_call_activity,
+        }
         
         for element in process.elements:
             # Check for duplicate IDs
@@ -100,37 +184,22 @@ class ProcessValidator:
                 errors.append(f"Element ID '{element.id}' is not a valid XML identifier")
             
             # Validate element name
-            if not element.name or not element.name.strip():
+            if not element.name or element.name.isspace():
                 errors.append(f"Element {element.id} must have a non-empty name")
             
-            # Collect start and end events
-            if isinstance(element, StartEvent):
-                start_events.append(element)
-            elif isinstance(element, EndEvent):
-                end_events.append(element)
-            elif isinstance(element, ScriptCall):
-                errors.extend(self._validate_script_call(element))
-            elif isinstance(element, ServiceTask):
-                errors.extend(self._validate_service_task(element))
-            elif isinstance(element, ProcessEntity):
-                errors.extend(self._validate_process_entity(element))
-            elif isinstance(element, ReceiveMessageEvent):
-                errors.extend(self._validate_receive_message(element))
-            elif isinstance(element, Gateway):
-                errors.extend(self._validate_gateway(element))
-            elif isinstance(element, CallActivity):
-                errors.extend(self._validate_call_activity(element))
-            # Subprocess and TimerEvent validated separately
+            validate_element = type_validators.get(element._kind)
+            if validate_element is not None:
+                errors.extend(validate_element(element))
 
         # Check for required start and end events
-        if not start_events:
+        if not ctx.start_events:
             errors.append("Process must have at least one start event")
         
-        if not end_events:
+        if not ctx.end_events:
             errors.append("Process must have at least one end event")
         
         # Check for required processEntity - must have EXACTLY one in any flow
-        process_entities = [e for e in process.elements if isinstance(e, ProcessEntity)]
+        process_entities = ctx.process_entities
         if len(process_entities) == 0:
             errors.append("Process must contain exactly one processEntity element")
         elif len(process_entities) > 1:
@@ -143,7 +212,7 @@ class ProcessValidator:
         """Validate script call element."""
         errors = []
         
-        if not script.script or not script.script.strip():
+        if not script.script or script.script.isspace():
             errors.append(f"Script call {script.id} must have a non-empty script")
         
         # Validate variable mappings
@@ -165,7 +234,7 @@ class ProcessValidator:
         """Validate service task element."""
         errors = []
         
-        if not service.task_type or not service.task_type.strip():
+        if not service.task_type or service.task_type.isspace():
             errors.append(f"Service task {service.id} must have a non-empty type")
         
         # Validate variable mappings
@@ -191,7 +260,7 @@ class ProcessValidator:
         """
         errors = []
         
-        if not entity.entity_name or not entity.entity_name.strip():
+        if not entity.entity_name or entity.entity_name.isspace():
             errors.append(f"Process entity {entity.id} must have a non-empty entityName")
         
         return errors
@@ -200,12 +269,12 @@ class ProcessValidator:
         """Validate receiveMessage intermediate catch event."""
         errors = []
 
-        if not event.message or not event.message.strip():
+        if not event.message or event.message.isspace():
             errors.append(
                 f"Receive message event '{event.id}' must have a non-empty message name"
             )
 
-        if not event.correlation_key or not event.correlation_key.strip():
+        if not event.correlation_key or event.correlation_key.isspace():
             errors.append(
                 f"Receive message event '{event.id}' must have a non-empty correlationKey"
             )
@@ -258,7 +327,7 @@ class ProcessValidator:
 
         for element in process.elements:
             if isinstance(element, StartEvent) and element.message is not None:
-                if not element.message or not element.message.strip():
+                if not element.message or element.message.isspace():
                     errors.append(
                         f"Message start event '{element.id}' must have a non-empty message name"
                     )
@@ -286,13 +355,12 @@ class ProcessValidator:
 
         return errors
 
-    def _validate_boundary_events(self, process: Process) -> List[str]:
+    def _validate_boundary_events(self, process: Process, ctx: _ValidationContext) -> List[str]:
         """Validate boundary events across all service tasks."""
         errors = []
-        # Collect all top-level element IDs for uniqueness check
-        all_ids: Set[str] = {e.id for e in process.elements}
+        # Top-level element IDs, for uniqueness and parent lookups
+        element_ids = ctx.element_ids
         boundary_ids: Set[str] = set()
-        element_ids: Set[str] = {e.id for e in process.elements}
 
         for element in process.elements:
             if not isinstance(element, ServiceTask):
@@ -300,7 +368,7 @@ class ProcessValidator:
 
             for be in element.boundary_events or []:
                 # ID uniqueness: check against top-level IDs and other boundary IDs
-                if be.id in all_ids or be.id in boundary_ids:
+                if be.id in element_ids or be.id in boundary_ids:
                     errors.append(
                         f"Boundary event '{be.id}' has a duplicate ID "
                         f"(conflicts with another element or boundary event)"
@@ -339,7 +407,7 @@ class ProcessValidator:
 
                 # BoundaryMessageEvent must have a correlationKey
                 if isinstance(be, BoundaryMessageEvent):
-                    if not be.correlation_key or not be.correlation_key.strip():
+                    if not be.correlation_key or be.correlation_key.isspace():
                         errors.append(
                             f"Boundary message event '{be.id}' must specify a correlationKey"
                         )
@@ -373,7 +441,7 @@ class ProcessValidator:
     def _validate_call_activity(self, ca: 'CallActivity') -> List[str]:
         """Validate callActivity element."""
         errors = []
-        if not ca.process_id or not ca.process_id.strip():
+        if not ca.process_id or ca.process_id.isspace():
             errors.append(
                 f"Call activity '{ca.id}' must have a non-empty processId"
             )
@@ -408,7 +476,9 @@ class ProcessValidator:
         if not end_events:
             errors.append(f"Subprocess '{sub.id}' must have at least one end event")
 
+        child_ids = set()
         for child in sub.elements:
+            child_ids.add(child.id)
             # ID uniqueness across subprocess boundaries
             if child.id in all_ids:
                 errors.append(
@@ -441,7 +511,6 @@ class ProcessValidator:
                 errors.extend(self._validate_subprocess_internal(child, all_ids))
 
         # Validate internal flows reference existing child element IDs
-        child_ids = {e.id for e in sub.elements}
         for flow in sub.flows or []:
             if flow.source_id not in child_ids:
                 errors.append(
@@ -456,11 +525,12 @@ class ProcessValidator:
 
         return errors
 
-    def _validate_composition(self, process: Process) -> List[str]:
+    def _validate_composition(self, process: Process, ctx: _ValidationContext) -> List[str]:
         """Validate composition elements: subprocess, callActivity, multi-instance."""
         errors = []
-        # Collect all top-level element IDs for cross-boundary uniqueness
-        all_ids: Set[str] = {e.id for e in process.elements}
+        # Top-level element IDs for cross-boundary uniqueness; subprocess
+        # validation adds child IDs, so work on a copy
+        all_ids: Set[str] = set(ctx.element_ids)
 
         for element in process.elements:
             if isinstance(element, Subprocess):
@@ -471,11 +541,11 @@ class ProcessValidator:
 
         return errors
 
-    def _validate_flows(self, process: Process) -> List[str]:
+    def _validate_flows(self, process: Process, ctx: _ValidationContext) -> List[str]:
         """Validate sequence flows."""
         errors = []
-        element_ids = {element.id for element in process.elements}
-        element_lookup = {e.id: e for e in process.elements}
+        element_ids = ctx.element_ids
+        element_lookup = ctx.element_lookup
 
         for flow in process.flows:
             # Check if source and target elements exist
@@ -501,21 +571,12 @@ class ProcessValidator:
 
         return errors
     
-    def _validate_structure(self, process: Process) -> List[str]:
+    def _validate_structure(self, process: Process, ctx: _ValidationContext) -> List[str]:
         """Validate process structure and connectivity."""
         errors = []
-        
-        # Build adjacency lists
-        outgoing = defaultdict(list)
-        incoming = defaultdict(list)
-        
-        for flow in process.flows:
-            outgoing[flow.source_id].append(flow.target_id)
-            incoming[flow.target_id].append(flow.source_id)
-        
-        # Find start and end events
-        start_events = [e for e in process.elements if isinstance(e, StartEvent)]
-        end_events = [e for e in process.elements if isinstance(e, EndEvent)]
+        outgoing = ctx.outgoing
+        incoming = ctx.incoming
+        start_events = ctx.start_events
         
         # Check start events have no incoming flows
         for start in start_events:
@@ -523,52 +584,46 @@ class ProcessValidator:
                 errors.append(f"Start event {start.id} cannot have incoming flows")
         
         # Check end events have no outgoing flows
-        for end in end_events:
+        for end in ctx.end_events:
             if end.id in outgoing:
                 errors.append(f"End event {end.id} cannot have outgoing flows")
         
-        # Check connectivity (simplified - each element should be reachable)
+        # Check connectivity: every element must be reachable from some start
         if start_events:
-            reachable = self._find_reachable_elements(start_events[0].id, outgoing)
-            all_element_ids = {e.id for e in process.elements}
-            unreachable = all_element_ids - reachable
+            reachable = self._find_reachable_elements(
+                [start.id for start in start_events], outgoing
+            )
+            unreachable = ctx.element_ids - reachable
             
             if unreachable:
-                errors.append(f"Unreachable elements: {', '.join(unreachable)}")
+                errors.append(f"Unreachable elements: {', '.join(sorted(unreachable))}")
         
         # Validate processEntity positioning
-        errors.extend(self._validate_process_entity_positioning(process, outgoing))
+        errors.extend(self._validate_process_entity_positioning(process, ctx))
         
         return errors
     
-    def _validate_zeebe_compatibility(self, process: Process) -> List[str]:
+    def _validate_zeebe_compatibility(self, process: Process, ctx: _ValidationContext) -> List[str]:
         """Validate Zeebe-specific requirements."""
         errors = []
         
         # Check for Zeebe-specific limitations
-        for element in process.elements:
-            if isinstance(element, ScriptCall):
-                # Zeebe requires specific script formats
-                if element.script and not self._is_valid_zeebe_expression(element.script):
-                    errors.append(f"Script in {element.id} may not be compatible with Zeebe: {element.script}")
+        for element in ctx.script_calls:
+            # Zeebe requires specific script formats
+            if element.script and not self._is_valid_zeebe_expression(element.script):
+                errors.append(f"Script in {element.id} may not be compatible with Zeebe: {element.script}")
         
         return errors
     
-    def _generate_warnings(self, process: Process) -> List[str]:
+    def _generate_warnings(self, process: Process, ctx: _ValidationContext) -> List[str]:
         """Generate warnings for potential issues."""
         warnings = []
         
         # Check for unused elements
-        flow_elements = set()
-        for flow in process.flows:
-            flow_elements.add(flow.source_id)
-            flow_elements.add(flow.target_id)
-        
-        all_elements = {e.id for e in process.elements}
-        unused_elements = all_elements - flow_elements
+        unused_elements = ctx.element_ids - ctx.flow_endpoint_ids
         
         if unused_elements:
-            warnings.append(f"Elements not connected by flows: {', '.join(unused_elements)}")
+            warnings.append(f"Elements not connected by flows: {', '.join(sorted(unused_elements))}")
         
         # Check for processes without version
         if not process.version:
@@ -576,10 +631,14 @@ class ProcessValidator:
         
         return warnings
     
-    def _find_reachable_elements(self, start_id: str, outgoing: Dict[str, List[str]]) -> Set[str]:
-        """Find all elements reachable from a start element."""
+    def _find_reachable_elements(self, start_ids: List[str], outgoing: Dict[str, List[str]]) -> Set[str]:
+        """Find all elements reachable from any of the start elements.
+
+        A single walk seeded with every start covers processes with several
+        entry points (e.g. a timer start next to a message start).
+        """
         visited = set()
-        stack = [start_id]
+        stack = list(start_ids)
         
         while stack:
             current = stack.pop()
@@ -587,29 +646,27 @@ class ProcessValidator:
                 continue
             
             visited.add(current)
-            stack.extend(outgoing.get(current, []))
+            stack.extend(outgoing.get(current, ()))
         
         return visited
     
-    def _validate_process_entity_positioning(self, process: Process, outgoing: Dict[str, List[str]]) -> List[str]:
+    def _validate_process_entity_positioning(self, process: Process, ctx: _ValidationContext) -> List[str]:
         """Validate that the processEntity element is positioned correctly.
         
         Since there must be exactly one processEntity, it must be the first task after a start task.
         """
         errors = []
         
-        # Find all ProcessEntity elements
-        process_entities = [e for e in process.elements if isinstance(e, ProcessEntity)]
+        process_entities = ctx.process_entities
         if not process_entities:
             return errors  # No processEntity elements to validate (this will be caught by other validation)
         
-        # Find all start events
-        start_events = [e for e in process.elements if isinstance(e, StartEvent)]
+        start_events = ctx.start_events
         if not start_events:
             return errors  # No start events (this will be caught by other validation)
         
-        # Create element lookup
-        element_lookup = {e.id: e for e in process.elements}
+        outgoing = ctx.outgoing
+        element_lookup = ctx.element_lookup
         
         # Since there should be exactly one processEntity, validate its positioning
         for entity in process_entities:
@@ -638,7 +695,8 @@ class ProcessValidator:
         
         return errors
     
-    def _is_valid_xml_id(self, id_str: str) -> bool:
+    @staticmethod
+    def _is_valid_xml_id(id_str: str) -> bool:
         """Check if string is a valid XML ID."""
         if not id_str:
             return False
@@ -648,13 +706,10 @@ class ProcessValidator:
             return False
         
         # Rest can be letters, digits, hyphens, underscores, or periods
-        for char in id_str[1:]:
-            if not (char.isalnum() or char in '-_.'):
-                return False
-        
-        return True
+        return _XML_ID_TAIL_RE.fullmatch(id_str, 1) is not None
     
-    def _is_valid_variable_name(self, var_name: str) -> bool:
+    @staticmethod
+    def _is_valid_variable_name(var_name: str) -> bool:
         """Check if string is a valid variable name."""
         if not var_name:
             return False
@@ -664,12 +719,12 @@ class ProcessValidator:
     
     def _is_valid_condition(self, condition: str) -> bool:
         """Basic validation of condition expressions."""
-        if not condition or not condition.strip():
+        if not condition or condition.isspace():
             return False
         
         # Basic syntax check - should contain some comparison or boolean logic
         # This is a simplified check - in practice, you might want to parse the expression
-        return any(op in condition for op in ['==', '!=', '>', '<', '>=', '<=', '&&', '||', 'true', 'false'])
+        return _CONDITION_TOKEN_RE.search(condition) is not None
     
     def _is_valid_zeebe_expression(self, expression: str) -> bool:
         """Check if expression is valid for Zeebe."""
@@ -678,4 +733,4 @@ class ProcessValidator:
         
         # Zeebe supports FEEL expressions and some JavaScript
         # This is a basic check - in practice, you'd want more sophisticated validation
-        return len(expression.strip()) > 0
+        return not expression.isspace()
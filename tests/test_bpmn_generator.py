@@ -1,15 +1,18 @@
 """Tests for the BPMN generator."""
 
 import pytest
+from dataclasses import FrozenInstanceError
 from pathlib import Path
 import sys
-from xml.etree.ElementTree import fromstring
+from xml.etree.ElementTree import fromstring, canonicalize
 
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from bpm_dsl.parser import parse_bpm_string
 from bpm_dsl.bpmn_generator import BPMNGenerator
+from bpm_dsl.layout_engine import Bounds
+from bpm_dsl.ast_nodes import Process, StartEvent, EndEvent, ServiceTask, ProcessEntity, Flow
 
 
 class TestBPMNGenerator:
@@ -343,6 +346,242 @@ class TestBPMNGenerator:
         condition_count = xml_content.count('<conditionExpression')
         assert condition_count == 1
 
+    def test_generate_to_file_matches_generate(self, tmp_path):
+        """Test that streaming to a file yields the same document as generate()."""
+        dsl_content = '''
+        process "File Process" {
+            id: "file-process"
+
+            start "Begin" {
+                id: "start-1"
+            }
+
+            gateway "Decision" {
+                id: "gateway-1"
+                type: xor
+            }
+
+            end "End A" {
+                id: "end-a"
+            }
+
+            end "End B" {
+                id: "end-b"
+            }
+
+            flow {
+                "start-1" -> "gateway-1"
+                "gateway-1" -> "end-a" [when: "condition == true"]
+                "gateway-1" -> "end-b" [otherwise]
+            }
+        }
+        '''
+
+        process = parse_bpm_string(dsl_content)
+        generator = BPMNGenerator()
+        output_file = tmp_path / "file-process.bpmn"
+        generator.generate_to_file(process, str(output_file))
+
+        written = output_file.read_bytes()
+        assert written.startswith(b'<?xml version="1.0" encoding="UTF-8"?>\n')
+
+        expected = canonicalize(generator.generate(process), strip_text=True)
+        assert canonicalize(written.decode('utf-8').split('\n', 1)[1], strip_text=True) == expected
+
+        saved_file = tmp_path / "saved-process.bpmn"
+        generator.save_to_file(process, str(saved_file))
+        assert saved_file.read_text(encoding='utf-8') == (
+            '<?xml version="1.0" encoding="UTF-8"?>\n' + generator.generate(process)
+        )
+
+    def test_generate_bytes_matches_generate(self):
+        """Test that generate_bytes() is the UTF-8 encoding of generate()."""
+        dsl_content = '''
+        process "Bytes Process – café" {
+            id: "bytes-process"
+
+            start "Begin" {
+                id: "start-1"
+            }
+
+            end "Complete" {
+                id: "end-1"
+            }
+
+            flow {
+                "start-1" -> "end-1"
+            }
+        }
+        '''
+
+        process = parse_bpm_string(dsl_content)
+        generator = BPMNGenerator()
+        assert generator.generate_bytes(process) == generator.generate(process).encode('utf-8')
+
+    def test_process_entity_appended_after_construction(self):
+        """Test that a processEntity appended to elements still gets its error definition."""
+        process = Process(name="Appended", id="appended")
+        process.elements.append(StartEvent(name="Begin", id="start-1"))
+        process.elements.append(ProcessEntity(name="Load", id="load", entity_name="Order"))
+        process.elements.append(EndEvent(name="Complete", id="end-1"))
+        process.flows.extend([Flow(source_id="start-1", target_id="load"),
+                              Flow(source_id="load", target_id="end-1")])
+
+        root = fromstring(BPMNGenerator().generate(process))
+
+        error_ids = [e.get('id') for e in root if e.tag.endswith('}error')]
+        assert "process-entity-validation-error" in error_ids
+        error_refs = [e.get('errorRef') for e in root.iter() if e.get('errorRef')]
+        assert set(error_refs) <= set(error_ids)
+
+    def test_element_subclass_uses_base_builder(self):
+        """Test that a subclass of a known AST node is rendered by its base type's builder."""
+        class AuditedServiceTask(ServiceTask):
+            pass
+
+        process = Process(name="Subclassed", id="subclassed", elements=[
+            StartEvent(name="Begin", id="start-1"),
+            AuditedServiceTask(name="Call API", id="call-api", task_type="api-call"),
+            EndEvent(name="Complete", id="end-1"),
+        ], flows=[
+            Flow(source_id="start-1", target_id="call-api"),
+            Flow(source_id="call-api", target_id="end-1"),
+        ])
+
+        root = fromstring(BPMNGenerator().generate(process))
+
+        service_tasks = [e for e in root.iter() if e.tag.endswith('}serviceTask')]
+        assert [e.get('id') for e in service_tasks] == ["call-api"]
+
+    def test_layout_bounds_are_immutable(self):
+        """Test that Bounds rejects mutation, so its derived edges cannot go stale."""
+        bounds = Bounds(x=10, y=20, width=100, height=80)
+        assert (bounds.center_x, bounds.center_y, bounds.right, bounds.bottom) == (60, 60, 110, 100)
+        with pytest.raises(FrozenInstanceError):
+            bounds.x = 0
+
+    def test_long_chain_diagram_is_complete(self):
+        """Test that every shape, edge and waypoint lands in the diagram of a long chain."""
+        task_count = 400
+        tasks = '\n'.join(
+            f'    scriptCall "Task {i}" {{ id: "task-{i}" script: "x" }}' for i in range(task_count)
+        )
+        chain = '\n'.join(f'        "task-{i}" -> "task-{i + 1}"' for i in range(task_count - 1))
+        dsl_content = f'''
+process "Long Chain" {{
+    id: "long-chain"
+    start "Begin" {{ id: "start-1" }}
+{tasks}
+    end "Complete" {{ id: "end-1" }}
+    flow {{
+        "start-1" -> "task-0"
+{chain}
+        "task-{task_count - 1}" -> "end-1"
+    }}
+}}
+'''
+
+        process = parse_bpm_string(dsl_content)
+        root = fromstring(BPMNGenerator().generate(process))
+
+        bpmndi = '{http://www.omg.org/spec/BPMN/20100524/DI}'
+        plane = root.find(f'{bpmndi}BPMNDiagram/{bpmndi}BPMNPlane')
+        edges = plane.findall(f'{bpmndi}BPMNEdge')
+        assert len(plane.findall(f'{bpmndi}BPMNShape')) == task_count + 2
+        assert len(edges) == task_count + 1
+        assert all(len(edge) >= 2 for edge in edges)
+
+    def test_diamond_chain_layout_is_linear(self):
+        """Test that stacked XOR diamonds are leveled without re-walking every path."""
+        diamond_count = 40
+        gateways = '\n'.join(
+            f'    gateway "Split {i}" {{ id: "g-{i}" }}\n'
+            f'    scriptCall "A {i}" {{ id: "a-{i}" script: "x" }}\n'
+            f'    scriptCall "B {i}" {{ id: "b-{i}" script: "x" }}'
+            for i in range(diamond_count)
+        )
+        flows = '\n'.join(
+            f'        "g-{i}" -> "a-{i}"\n        "g-{i}" -> "b-{i}"\n'
+            f'        "a-{i}" -> "g-{i + 1}"\n        "b-{i}" -> "g-{i + 1}"'
+            for i in range(diamond_count - 1)
+        )
+        last = diamond_count - 1
+        dsl_content = f'''
+process "Diamonds" {{
+    id: "diamonds"
+    start "Begin" {{ id: "start-1" }}
+{gateways}
+    end "Complete" {{ id: "end-1" }}
+    flow {{
+        "start-1" -> "g-0"
+{flows}
+        "g-{last}" -> "end-1"
+    }}
+}}
+'''
+
+        # Every path through n diamonds doubles, so path-by-path leveling never finishes
+        generator = BPMNGenerator()
+        generator.generate(parse_bpm_string(dsl_content))
+
+        levels = {node_id: level for level, node_ids in enumerate(generator.layout_engine.levels)
+                  for node_id in node_ids}
+        assert levels['g-1'] == 3
+        assert levels['a-1'] == levels['b-1'] == 4
+        assert levels['end-1'] == 2 * last + 2
+
+    def test_parallel_paths_do_not_cross(self):
+        """Test that elements are ordered within a level by their neighbors, not by ID."""
+        dsl_content = '''
+process "Two Paths" {
+    id: "two-paths"
+    start "Begin" { id: "start-1" }
+    scriptCall "Top" { id: "t-z" script: "x" }
+    scriptCall "Bottom" { id: "t-a" script: "x" }
+    end "Bottom Done" { id: "u-z" }
+    end "Top Done" { id: "u-a" }
+    flow {
+        "start-1" -> "t-z"
+        "start-1" -> "t-a"
+        "t-z" -> "u-a"
+        "t-a" -> "u-z"
+    }
+}
+'''
+
+        generator = BPMNGenerator()
+        generator.generate(parse_bpm_string(dsl_content))
+        positions = generator.layout_engine.positions
+
+        assert positions['t-z'].y < positions['t-a'].y
+        assert positions['u-a'].y < positions['u-z'].y
+
+    def test_loop_back_flow_is_laid_out(self):
+        """Test that a retry loop back to an earlier task is drawn instead of hanging the layout."""
+        dsl_content = '''
+process "Retry Loop" {
+    id: "retry-loop"
+    start "Begin" { id: "start-1" }
+    scriptCall "Attempt" { id: "attempt" script: "x" }
+    gateway "Succeeded?" { id: "check" }
+    end "Done" { id: "end-1" }
+    flow {
+        "start-1" -> "attempt"
+        "attempt" -> "check"
+        "check" -> "end-1" [when: "ok == true"]
+        "check" -> "attempt" [otherwise]
+    }
+}
+'''
+
+        root = fromstring(BPMNGenerator().generate(parse_bpm_string(dsl_content)))
+
+        bpmndi = '{http://www.omg.org/spec/BPMN/20100524/DI}'
+        plane = root.find(f'{bpmndi}BPMNDiagram/{bpmndi}BPMNPlane')
+        assert len(plane.findall(f'{bpmndi}BPMNShape')) == 4
+        edge_ids = {edge.get('bpmnElement') for edge in plane.findall(f'{bpmndi}BPMNEdge')}
+        assert 'flow_check_to_attempt' in edge_ids
+
 
 class TestTimerEventBPMNGeneration:
     """Test BPMN generation for timer intermediate catch events."""
@@ -1413,6 +1652,36 @@ class TestSubprocessBPMNGeneration:
         assert len(service_tasks) == 1
         assert service_tasks[0].get('id') == 'process-item'
 
+    def test_subprocess_gateway_default_flow(self):
+        """A gateway nested in a subprocess gets the default flow declared inside it."""
+        dsl = '''
+        process "T" {
+            id: "t"
+            start "S" {}
+            subprocess "Route" {
+                start "Begin" {}
+                gateway "Check" {}
+                end "Ok" {}
+                end "Fallback" {}
+                flow {
+                    "begin" -> "check"
+                    "check" -> "ok" [when: "valid == true"]
+                    "check" -> "fallback" [otherwise]
+                }
+            }
+            end "E" {}
+            flow {
+                "s" -> "route"
+                "route" -> "e"
+            }
+        }
+        '''
+        root = self._xml_root(self._parse_and_generate(dsl))
+        sub = [e for e in self._bpmn_process(root) if e.tag.endswith('subProcess')][0]
+
+        gateway = [e for e in sub if e.tag.endswith('exclusiveGateway')][0]
+        assert gateway.get('default') == 'flow_check_to_fallback'
+
     def test_subprocess_multi_instance_sequential(self):
         """Subprocess with forEach generates multiInstanceLoopCharacteristics (sequential)."""
         dsl = '''
@@ -0,0 +1,94 @@
+"""Tests for the process metadata extraction script."""
+
+import importlib.util
+import json
+from pathlib import Path
+
+import pytest
+import yaml
+
+SCRIPT_PATH = Path(__file__).parent.parent / "scripts" / "extract_process_metadata.py"
+
+_spec = importlib.util.spec_from_file_location("extract_process_metadata", SCRIPT_PATH)
+extract_process_metadata = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(extract_process_metadata)
+
+
+def _full_parse_post_endpoint(data: bytes):
+    """First POST path according to a full YAML parse."""
+    spec = yaml.safe_load(data)
+    return next((path for path, methods in spec['paths'].items() if 'post' in methods), None)
+
+
+class TestFindPostEndpointFast:
+    """Test the line-based POST endpoint scan and its hand-off to the YAML parse."""
+
+    def test_plain_layout_finds_first_post(self):
+        """Test that the plain 2-space layout is read without a full parse."""
+        data = (b"openapi: 3.0.0\n"
+                b"paths:\n"
+                b"  /a:\n"
+                b"    get:\n"
+                b"      summary: read\n"
+                b"  /b:\n"
+                b"    post:\n"
+                b"      summary: create\n"
+                b"components: {}\n")
+        assert extract_process_metadata._find_post_endpoint_fast(data) == "/b"
+
+    def test_commented_path_key_falls_back(self):
+        """Test that a path key with a trailing comment is left to the YAML parse."""
+        data = (b"paths:\n"
+                b"  /a:\n"
+                b"    get:\n"
+                b"      summary: read\n"
+                b"  /b:  # create\n"
+                b"    post:\n"
+                b"      summary: create\n")
+        assert extract_process_metadata._find_post_endpoint_fast(data) is None
+        assert _full_parse_post_endpoint(data) == "/b"
+
+    def test_quoted_path_key_falls_back(self):
+        """Test that a quoted path key holding the POST is left to the YAML parse."""
+        data = (b"paths:\n"
+                b"  '/a':\n"
+                b"    post:\n"
+                b"      summary: create\n"
+                b"  /b:\n"
+                b"    post:\n"
+                b"      summary: other\n")
+        assert extract_process_metadata._find_post_endpoint_fast(data) is None
+        assert _full_parse_post_endpoint(data) == "/a"
+
+    def test_extract_uses_full_parse_for_commented_key(self, tmp_path):
+        """Test that extraction returns the full-parse answer when the scan bails out."""
+        yaml_file = tmp_path / "api.yaml"
+        yaml_file.write_bytes(b"paths:\n"
+                              b"  /a:\n"
+                              b"    get:\n"
+                              b"      summary: read\n"
+                              b"  /b:  # create\n"
+                              b"    post:\n"
+                              b"      summary: create\n")
+        assert extract_process_metadata.extract_post_endpoint_from_yaml(yaml_file) == "/b"
+
+
+class TestDumpMappings:
+    """Test serialization of the process mappings file."""
+
+    MAPPINGS = {
+        None: {"processId": None, "entityName": "Café", "postEndpoint": "/orders"},
+        "order-process": {"processId": "order-process", "entityName": "Order", "postEndpoint": None},
+    }
+
+    def test_process_without_id_is_keyed_null(self):
+        """Test that a missing process id is written as a "null" key instead of failing."""
+        data = extract_process_metadata._dump_mappings(self.MAPPINGS)
+        assert list(json.loads(data)) == ["null", "order-process"]
+
+    def test_json_fallback_matches_orjson(self, monkeypatch):
+        """Test that the json fallback writes the same bytes as orjson."""
+        pytest.importorskip("orjson")
+        data = extract_process_metadata._dump_mappings(self.MAPPINGS)
+        monkeypatch.setattr(extract_process_metadata, "orjson", None)
+        assert extract_process_metadata._dump_mappings(self.MAPPINGS) == data
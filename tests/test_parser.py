@@ -7,7 +7,7 @@ import sys
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from bpm_dsl.parser import BPMParser, parse_bpm_string, desugar_duration
+from bpm_dsl.parser import BPMParser, parse_bpm_file, parse_bpm_string, desugar_duration
 from bpm_dsl.ast_nodes import (
     Process, StartEvent, EndEvent, ScriptCall, Gateway, Flow,
     TimerEvent, TimerDefinition, BoundaryTimerEvent, BoundaryErrorEvent,
@@ -350,6 +350,132 @@ class TestBPMParser:
         assert unconditional_flow.source_id == "start-1"
         assert unconditional_flow.target_id == "gateway-1"
 
+    def test_ast_nodes_are_slotted(self):
+        """AST nodes use __slots__ and carry no per-instance __dict__."""
+        process = parse_bpm_string('''
+        process "Slotted" {
+            id: "slotted"
+            start "Begin" { }
+            end "Done" { }
+            flow {
+                "begin" -> "done"
+            }
+        }
+        ''')
+
+        assert not hasattr(process, '__dict__')
+        assert all(not hasattr(node, '__dict__') for node in [*process.elements, *process.flows])
+
+    def test_process_entity_returns_first_entity(self):
+        """Process.process_entity returns the first processEntity element, or None."""
+        process = parse_bpm_string('''
+        process "Entity" {
+            id: "entity"
+            start "Begin" { }
+            processEntity "Load" { entityName: "Order" }
+            end "Done" { }
+            flow {
+                "begin" -> "load"
+                "load" -> "done"
+            }
+        }
+        ''')
+
+        assert process.process_entity is process.elements[1]
+        assert process.process_entity.entity_name == "Order"
+        assert process.process_entity._generated_elements == {}
+        assert parse_bpm_string('process "None" { id: "none" }').process_entity is None
+
+    def test_repeated_parse_returns_independent_ast(self):
+        """Parsing the same text twice must not share mutable AST nodes."""
+        dsl_content = '''
+        process "Cached Process" {
+            id: "cached-process"
+
+            start "Begin" {
+                id: "start-1"
+            }
+
+            end "Complete" {
+                id: "end-1"
+            }
+
+            flow {
+                "start-1" -> "end-1"
+            }
+        }
+        '''
+
+        first = parse_bpm_string(dsl_content)
+        first.elements.pop()
+        first.flows[0].target_id = "mutated"
+
+        second = parse_bpm_string(dsl_content)
+        assert second is not first
+        assert len(second.elements) == 2
+        assert second.flows[0].target_id == "end-1"
+
+    def test_parse_file_sets_openapi_path(self, tmp_path):
+        """parse_bpm_file attaches the paired YAML path; parse_bpm_string does not."""
+        dsl_content = '''
+        process "File Process" {
+            id: "file-process"
+
+            start "Begin" {
+                id: "start-1"
+            }
+
+            end "Complete" {
+                id: "end-1"
+            }
+
+            flow {
+                "start-1" -> "end-1"
+            }
+        }
+        '''
+        bpm_file = tmp_path / "file_process.bpm"
+        bpm_file.write_text(dsl_content, encoding="utf-8")
+        yaml_file = tmp_path / "file_process.yaml"
+        yaml_file.write_text("openapi: 3.0.0\n", encoding="utf-8")
+
+        from_file = parse_bpm_file(bpm_file)
+        from_string = parse_bpm_string(dsl_content)
+
+        assert from_file.openapi_file_path == str(yaml_file)
+        assert from_string.openapi_file_path is None
+
+    def test_parse_file_requires_openapi_file(self, tmp_path):
+        """parse_bpm_file fails when no paired .yaml/.yml file exists."""
+        bpm_file = tmp_path / "lonely.bpm"
+        bpm_file.write_text('process "Lonely" { }', encoding="utf-8")
+
+        with pytest.raises(FileNotFoundError, match="Missing OpenAPI specification"):
+            parse_bpm_file(bpm_file)
+
+    def test_parse_missing_file_reports_bpm_path(self, tmp_path):
+        """A missing .bpm file is reported before the OpenAPI pairing check."""
+        bpm_file = tmp_path / "absent.bpm"
+
+        with pytest.raises(FileNotFoundError, match="File not found"):
+            parse_bpm_file(bpm_file)
+        with pytest.raises(FileNotFoundError, match="File not found"):
+            BPMParser().parse_file(bpm_file)
+
+    def test_parsers_share_compiled_grammar(self, tmp_path):
+        """BPMParser instances reuse one Lark parser but keep their own OpenAPI path."""
+        bpm_file = tmp_path / "shared.bpm"
+        bpm_file.write_text('process "Shared" { id: "shared" }', encoding="utf-8")
+        (tmp_path / "shared.yaml").write_text("openapi: 3.0.0\n", encoding="utf-8")
+
+        plain = BPMParser()
+        with_spec = BPMParser("spec.yaml")
+        assert plain.parser is with_spec.parser
+
+        assert plain.parse_string('process "A" { id: "a" }').openapi_file_path is None
+        assert with_spec.parse_string('process "B" { id: "b" }').openapi_file_path == "spec.yaml"
+        assert plain.parse_file(bpm_file).openapi_file_path == str(tmp_path / "shared.yaml")
+
 
 class TestDesugarDuration:
     """Test duration shorthand desugaring."""
@@ -763,6 +763,24 @@ class TestISO8601Validation:
         assert not v._is_valid_iso8601_cycle("")
 
 
+class TestXMLIdValidation:
+    """Unit tests for the XML identifier helper in ProcessValidator."""
+
+    def test_valid_xml_ids(self):
+        v = ProcessValidator()
+        assert v._is_valid_xml_id("start-1")
+        assert v._is_valid_xml_id("_private.v2")
+        assert v._is_valid_xml_id("etapa-ação")
+
+    def test_invalid_xml_ids(self):
+        v = ProcessValidator()
+        assert not v._is_valid_xml_id("")
+        assert not v._is_valid_xml_id("1st")       # must not start with a digit
+        assert not v._is_valid_xml_id("-dash")
+        assert not v._is_valid_xml_id("has space")
+        assert not v._is_valid_xml_id("trailing\n")
+
+
 class TestSubprocessValidation:
     """Validator rules for embedded subprocesses."""
 
@@ -1134,5 +1152,87 @@ class TestMultiInstanceValidation:
         assert result.is_valid, f"Expected valid, got errors: {result.errors}"
 
 
+class TestStructureValidation:
+    """Connectivity rules across the whole process graph."""
+
+    def test_every_start_event_seeds_reachability(self):
+        """Elements fed only by a second start event are not unreachable."""
+        dsl = '''
+        process "T" {
+            id: "t"
+            start "Scheduled" { timer: cycle(1h) }
+            start "On Demand" { message: "run" }
+            processEntity "Load" { entityName: "Foo" }
+            end "E" {}
+            flow {
+                "scheduled" -> "load"
+                "on-demand" -> "load"
+                "load" -> "e"
+            }
+        }
+        '''
+        result = ProcessValidator().validate(parse_bpm_string(dsl))
+        assert result.is_valid, f"Expected valid, got errors: {result.errors}"
+
+    def test_unreachable_element_reported(self):
+        """An element no start event leads to is still reported."""
+        dsl = '''
+        process "T" {
+            id: "t"
+            start "S" {}
+            processEntity "Load" { entityName: "Foo" }
+            serviceTask "Orphan" { type: "orphan" }
+            end "E" {}
+            flow {
+                "s" -> "load"
+                "load" -> "e"
+                "orphan" -> "e"
+            }
+        }
+        '''
+        result = ProcessValidator().validate(parse_bpm_string(dsl))
+        assert "Unreachable elements: orphan" in result.errors
+
+    def test_disconnected_elements_listed_in_sorted_order(self):
+        """Set-derived ID lists are reported sorted, so messages are stable."""
+        dsl = '''
+        process "T" {
+            id: "t"
+            start "S" {}
+            processEntity "Load" { entityName: "Foo" }
+            serviceTask "Zeta" { type: "z" }
+            serviceTask "Alpha" { type: "a" }
+            serviceTask "Mu" { type: "m" }
+            end "E" {}
+            flow {
+                "s" -> "load"
+                "load" -> "e"
+            }
+        }
+        '''
+        result = ProcessValidator().validate(parse_bpm_string(dsl))
+        assert "Unreachable elements: alpha, mu, zeta" in result.errors
+        assert "Elements not connected by flows: alpha, mu, zeta" in result.warnings
+
+    def test_empty_process_stops_before_flow_checks(self):
+        """A process without elements is not buried under per-flow errors."""
+        dsl = '''
+        process "T" {
+            id: "t"
+            flow {
+                "a" -> "b"
+                "b" -> "c"
+            }
+        }
+        '''
+        result = ProcessValidator().validate(parse_bpm_string(dsl))
+        assert not result.is_valid
+        assert result.errors == [
+            "Process must have at least one start event",
+            "Process must have at least one end event",
+            "Process must contain exactly one processEntity element",
+        ]
+
+
 if __name__ == "__main__":
     pytest.main([__file__])